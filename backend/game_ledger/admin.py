@@ -1,5 +1,58 @@
+import csv
+import io
+import json
+from itertools import islice
+
 from django.contrib import admin
-from .models import GameSession, GameEvent, GameAnalytics, DailyProfitStats
+from django.db.models import F
+from django.http import StreamingHttpResponse
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+from .models import (
+    GameSession, GameEvent, GameAnalytics, DailyProfitStats, DailySessionStats, DailyAnalyticsStats
+)
+from .profit import calculate_profit_percentages_for_dates, save_profit_stats
+
+
+# Changelist colors for each GameAnalytics outcome
+_OUTCOME_COLORS = {
+    'WIN': 'green',
+    'LOSS': 'red',
+    'PERFECT': 'blue'
+}
+
+
+def _sign_color(value):
+    """Green for gains, red for losses, black for break-even"""
+    return 'green' if value > 0 else 'red' if value < 0 else 'black'
+
+
+def export_pages(queryset, *fields, batch_size=2000):
+    """
+    Yield pages of values_list() tuples read through QuerySet.iterator().
+    On PostgreSQL this streams rows from a server-side cursor, so memory
+    is bounded by batch_size rather than by the size of the export.
+    """
+    rows = queryset.values_list(*fields).iterator(chunk_size=batch_size)
+    while True:
+        page = list(islice(rows, batch_size))
+        if not page:
+            return
+        yield page
+
+
+def csv_chunks(header, pages):
+    """Render a header and pages of rows into CSV text, one chunk per page"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for rows in pages:
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue()
 
 
 class GameEventInline(admin.TabularInline):
@@ -9,6 +62,13 @@ class GameEventInline(admin.TabularInline):
     readonly_fields = ('event_type', 'amount', 'balance', 'multiplier', 'cell_position', 'timestamp')
     fields = ('event_type', 'amount', 'balance', 'multiplier', 'cell_position', 'timestamp')
 
+    def get_queryset(self, request):
+        # Only the change view renders the inline, so load just the displayed columns
+        return super().get_queryset(request).only(
+            'id', 'session', 'event_type', 'amount', 'balance', 'multiplier',
+            'cell_row', 'cell_col', 'timestamp'
+        )
+
     def has_add_permission(self, request, obj=None):
         return False
 
@@ -43,9 +103,6 @@ class GameSessionAdmin(admin.ModelAdmin):
 
     inlines = [GameEventInline]
 
-    def get_queryset(self, request):
-        return super().get_queryset(request).prefetch_related('events')
-
 
 @admin.register(GameEvent)
 class GameEventAdmin(admin.ModelAdmin):
@@ -53,23 +110,33 @@ class GameEventAdmin(admin.ModelAdmin):
 
     list_display = ('event_type', 'session', 'amount', 'balance', 'timestamp')
     list_filter = ('event_type', 'timestamp', 'session__status')
-    search_fields = ('session__user_id', 'session__id')
-    readonly_fields = ('id', 'timestamp')
+    search_fields = ('session__user_id', 'session__id', 'public_id')
+    readonly_fields = ('id', 'public_id', 'timestamp')
+    raw_id_fields = ('session',)
 
     fieldsets = (
         ('Event Information', {
-            'fields': ('id', 'session', 'event_type', 'timestamp')
+            'fields': ('id', 'public_id', 'session', 'event_type', 'timestamp')
         }),
         ('Game Data', {
-            'fields': ('amount', 'balance', 'multiplier', 'cell_position')
+            'fields': ('amount', 'balance', 'multiplier', 'cell_row', 'cell_col')
         }),
     )
 
+    list_select_related = ('session',)
+
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('session')
+        queryset = super().get_queryset(request).select_related('session')
+        if request.resolver_match and request.resolver_match.url_name.endswith('_changelist'):
+            # The changelist only renders a handful of event and session columns
+            queryset = queryset.only(
+                'id', 'event_type', 'amount', 'balance', 'timestamp',
+                'session', 'session__username', 'session__status'
+            )
+        return queryset
 
     def session(self, obj):
-        return f"{obj.session.username} - {obj.session.status}"
+        return f"{obj.session.username} - {obj.session.status_name}"
     session.short_description = "Session"
 
 
@@ -121,40 +188,35 @@ class GameAnalyticsAdmin(admin.ModelAdmin):
 
     # Custom display methods
     def get_queryset(self, request):
-        return super().get_queryset(request).order_by('-created_at')
+        # Let the database compute the per-row profit columns alongside the row fetch
+        return super().get_queryset(request).annotate(
+            profit=F('winning_amount') - F('stake_amount'),
+            house_profit=F('stake_amount') - F('winning_amount'),
+        ).order_by('-created_at')
 
     def colored_outcome(self, obj):
         """Display game outcome with color coding"""
-        colors = {
-            'WIN': 'green',
-            'LOSS': 'red',
-            'PERFECT': 'blue'
-        }
-        color = colors.get(obj.game_outcome, 'black')
-        return f'<span style="color: {color}; font-weight: bold;">{obj.game_outcome}</span>'
-    colored_outcome.allow_tags = True
+        color = _OUTCOME_COLORS.get(obj.game_outcome, 'black')
+        return format_html('<span style="color: {}; font-weight: bold;">{}</span>', color, obj.game_outcome)
     colored_outcome.short_description = 'Outcome'
 
     def profit_loss(self, obj):
         """Display profit/loss with color coding"""
-        profit = obj.winning_amount - obj.stake_amount
-        color = 'green' if profit > 0 else 'red' if profit < 0 else 'black'
-        return f'<span style="color: {color}; font-weight: bold;">₦{profit:,.2f}</span>'
-    profit_loss.allow_tags = True
+        return format_html(
+            '<span style="color: {}; font-weight: bold;">{}</span>', _sign_color(obj.profit), f'₦{obj.profit:,.2f}'
+        )
     profit_loss.short_description = 'Profit/Loss'
+    profit_loss.admin_order_field = 'profit'
 
     def house_edge_contribution(self, obj):
         """Calculate house edge contribution for this game"""
-        house_profit = obj.stake_amount - obj.winning_amount
-        return f'₦{house_profit:,.2f}'
+        return f'₦{obj.house_profit:,.2f}'
     house_edge_contribution.short_description = 'House Profit'
+    house_edge_contribution.admin_order_field = 'house_profit'
 
     # Add custom columns to list display
     list_display = list_display + ('colored_outcome', 'profit_loss', 'house_edge_contribution')
 
-    # Enable date hierarchy for easy filtering
-    date_hierarchy = 'created_at'
-
     # Set default ordering
     ordering = ['-created_at']
 
@@ -162,28 +224,20 @@ class GameAnalyticsAdmin(admin.ModelAdmin):
     actions = ['export_as_csv']
 
     def export_as_csv(self, request, queryset):
-        """Export selected records as CSV"""
-        import csv
-        from django.http import HttpResponse
-
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="game_analytics.csv"'
-
-        writer = csv.writer(response)
-        writer.writerow([
+        """Export selected records as CSV, streamed page by page"""
+        header = [
             'ID', 'Player Name', 'Game Type', 'Bomb Rate', 'Stake Amount',
             'Winning Amount', 'Multiplier', 'Cards Flipped', 'Game Outcome',
             'Created At', 'Session ID'
-        ])
-
-        for obj in queryset:
-            writer.writerow([
-                obj.id, obj.player_name, obj.game_type, obj.bomb_rate,
-                obj.stake_amount, obj.winning_amount, obj.multiplier,
-                obj.cards_flipped, obj.game_outcome, obj.created_at,
-                obj.session_id
-            ])
-
+        ]
+        pages = export_pages(
+            queryset, 'id', 'player_name', 'game_type', 'bomb_rate', 'stake_amount',
+            'winning_amount', 'multiplier', 'cards_flipped', 'game_outcome',
+            'created_at', 'session_id'
+        )
+
+        response = StreamingHttpResponse(csv_chunks(header, pages), content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="game_analytics.csv"'
         return response
     export_as_csv.short_description = "Export selected records as CSV"
 
@@ -195,8 +249,8 @@ class DailyProfitStatsAdmin(admin.ModelAdmin):
     list_display = (
         'date',
         'formatted_profit_data',
-        'total_game_types',
-        'average_profit',
+        'game_types_count',
+        'avg_profit',
         'created_at',
         'updated_at'
     )
@@ -215,8 +269,8 @@ class DailyProfitStatsAdmin(admin.ModelAdmin):
         'created_at',
         'updated_at',
         'formatted_profit_json',
-        'total_game_types',
-        'average_profit'
+        'game_types_count',
+        'avg_profit'
     )
 
     fieldsets = (
@@ -227,7 +281,7 @@ class DailyProfitStatsAdmin(admin.ModelAdmin):
             'fields': ('profit_data', 'formatted_profit_json')
         }),
         ('Statistics', {
-            'fields': ('total_game_types', 'average_profit'),
+            'fields': ('game_types_count', 'avg_profit'),
             'classes': ('collapse',)
         }),
     )
@@ -238,99 +292,144 @@ class DailyProfitStatsAdmin(admin.ModelAdmin):
     # Enable date hierarchy for easy filtering
     date_hierarchy = 'date'
 
+    def save_model(self, request, obj, form, change):
+        # Keep the denormalized summary columns in step with hand-edited profit_data
+        for field, value in DailyProfitStats.summarize(obj.profit_data or {}).items():
+            setattr(obj, field, value)
+        super().save_model(request, obj, form, change)
+
     # Custom display methods
     def formatted_profit_data(self, obj):
         """Display profit data in a readable format"""
         if not obj.profit_data:
             return "No data"
 
-        formatted = []
-        for game_type, profit in obj.profit_data.items():
-            color = 'green' if profit > 0 else 'red' if profit < 0 else 'black'
-            formatted.append(
-                f'<span style="color: {color}; font-weight: bold;">{game_type}: {profit}%</span>'
+        return format_html_join(
+            mark_safe('<br>'),
+            '<span style="color: {}; font-weight: bold;">{}: {}%</span>',
+            (
+                (_sign_color(profit), game_type, profit)
+                for game_type, profit in obj.profit_data.items()
             )
-        return '<br>'.join(formatted)
-    formatted_profit_data.allow_tags = True
+        )
     formatted_profit_data.short_description = 'Profit by Game Type'
 
     def formatted_profit_json(self, obj):
         """Display profit data as formatted JSON"""
-        import json
         if not obj.profit_data:
             return "No data"
         return json.dumps(obj.profit_data, indent=2)
     formatted_profit_json.short_description = 'Profit Data (JSON)'
 
-    def total_game_types(self, obj):
-        """Count of game types with profit data"""
-        return len(obj.profit_data) if obj.profit_data else 0
-    total_game_types.short_description = 'Game Types Count'
-
-    def average_profit(self, obj):
-        """Calculate average profit across all game types"""
-        if not obj.profit_data:
-            return "N/A"
-
-        profits = list(obj.profit_data.values())
-        if not profits:
-            return "N/A"
-
-        avg = sum(profits) / len(profits)
-        color = 'green' if avg > 0 else 'red' if avg < 0 else 'black'
-        return f'<span style="color: {color}; font-weight: bold;">{avg:.2f}%</span>'
-    average_profit.allow_tags = True
-    average_profit.short_description = 'Average Profit %'
-
     # Add actions
     actions = ['recalculate_profit_stats', 'export_profit_csv']
 
     def recalculate_profit_stats(self, request, queryset):
-        """Recalculate profit stats for selected dates"""
-        from django.core.management import call_command
-
-        count = 0
-        for obj in queryset:
-            try:
-                call_command('calculate_daily_profit', date=obj.date.strftime('%Y-%m-%d'), force=True)
-                count += 1
-            except Exception as e:
-                self.message_user(request, f"Error recalculating {obj.date}: {e}", level='ERROR')
-
-        if count > 0:
-            self.message_user(request, f"Successfully recalculated {count} profit stats records.")
-    recalculate_profit_stats.short_description = "Recalculate profit stats for selected dates"
+        """Recalculate profit stats for all selected dates with one aggregate query"""
+        dates = list(queryset.values_list('date', flat=True))
 
-    def export_profit_csv(self, request, queryset):
-        """Export selected profit stats as CSV"""
-        import csv
-        from django.http import HttpResponse
-        import json
+        try:
+            profit_by_date = calculate_profit_percentages_for_dates(dates)
+            save_profit_stats(profit_by_date)
+        except Exception as e:
+            self.message_user(request, f"Error recalculating profit stats: {e}", level='ERROR')
+            return
 
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="daily_profit_stats.csv"'
+        self.message_user(request, f"Successfully recalculated {len(profit_by_date)} profit stats records.")
+    recalculate_profit_stats.short_description = "Recalculate profit stats for selected dates"
 
-        writer = csv.writer(response)
-        writer.writerow([
+    def export_profit_csv(self, request, queryset):
+        """Export selected profit stats as CSV, streamed page by page"""
+        header = [
             'Date', 'Profit Data (JSON)', 'Game Types Count', 'Average Profit %',
             'Created At', 'Updated At'
-        ])
-
-        for obj in queryset:
-            avg_profit = "N/A"
-            if obj.profit_data:
-                profits = list(obj.profit_data.values())
-                if profits:
-                    avg_profit = f"{sum(profits) / len(profits):.2f}%"
-
-            writer.writerow([
-                obj.date,
-                json.dumps(obj.profit_data) if obj.profit_data else "{}",
-                len(obj.profit_data) if obj.profit_data else 0,
-                avg_profit,
-                obj.created_at,
-                obj.updated_at
-            ])
+        ]
+
+        def format_row(row):
+            date, profit_data, game_types_count, avg_profit, created_at, updated_at = row
+            return [
+                date,
+                json.dumps(profit_data) if profit_data else "{}",
+                game_types_count,
+                f"{avg_profit:.2f}%" if avg_profit is not None else "N/A",
+                created_at,
+                updated_at
+            ]
+
+        pages = (
+            map(format_row, page)
+            for page in export_pages(
+                queryset, 'date', 'profit_data', 'game_types_count', 'avg_profit',
+                'created_at', 'updated_at'
+            )
+        )
 
+        response = StreamingHttpResponse(csv_chunks(header, pages), content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="daily_profit_stats.csv"'
         return response
     export_profit_csv.short_description = "Export selected profit stats as CSV"
+
+
+@admin.register(DailySessionStats)
+class DailySessionStatsAdmin(admin.ModelAdmin):
+    """Admin interface for DailySessionStats - daily GameSession rollups"""
+
+    list_display = (
+        'date',
+        'stake',
+        'bomb_probability',
+        'total_sessions',
+        'cashed_out',
+        'bomb_hits',
+        'total_stakes',
+        'total_payouts',
+        'updated_at'
+    )
+
+    list_filter = (
+        'stake',
+        'bomb_probability'
+    )
+
+    readonly_fields = (
+        'updated_at',
+    )
+
+    # Set default ordering (most recent first)
+    ordering = ['-date', 'stake', 'bomb_probability']
+
+    # Enable date hierarchy for easy filtering
+    date_hierarchy = 'date'
+
+
+@admin.register(DailyAnalyticsStats)
+class DailyAnalyticsStatsAdmin(admin.ModelAdmin):
+    """Admin interface for DailyAnalyticsStats - daily GameAnalytics rollups"""
+
+    list_display = (
+        'date',
+        'game_type',
+        'bomb_rate',
+        'total_sessions',
+        'wins',
+        'losses',
+        'perfect_games',
+        'total_stakes',
+        'total_payouts',
+        'updated_at'
+    )
+
+    list_filter = (
+        'game_type',
+        'bomb_rate'
+    )
+
+    readonly_fields = (
+        'updated_at',
+    )
+
+    # Set default ordering (most recent first)
+    ordering = ['-date', 'game_type', 'bomb_rate']
+
+    # Enable date hierarchy for easy filtering
+    date_hierarchy = 'date'
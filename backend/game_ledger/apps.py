@@ -5,3 +5,7 @@ class GameLedgerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'game_ledger'
     verbose_name = 'Game Ledger'
+
+    def ready(self):
+        # Connect the signal receivers that keep rollups and cached payloads fresh
+        from . import profit, rollups, views  # noqa: F401
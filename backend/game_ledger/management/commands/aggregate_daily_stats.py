@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from datetime import timedelta
+
+from game_ledger.rollups import rebuild_daily_session_stats, rebuild_daily_analytics_stats, unmarked_rollup_dates
+
+
+class Command(BaseCommand):
+    help = (
+        'Roll up GameSession statistics per day and (stake, bomb rate) into DailySessionStats, '
+        'and GameAnalytics statistics per day and (game type, bomb rate) into DailyAnalyticsStats'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date',
+            type=str,
+            help='Last day to roll up (YYYY-MM-DD). Defaults to yesterday.',
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=1,
+            help='Number of days ending at --date to roll up (for backfills).',
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+
+        # Determine the last day to roll up
+        if options['date']:
+            try:
+                end_date = timezone.datetime.strptime(options['date'], '%Y-%m-%d').date()
+            except ValueError:
+                self.stdout.write(
+                    self.style.ERROR('Invalid date format. Use YYYY-MM-DD')
+                )
+                return
+        else:
+            end_date = today - timedelta(days=1)
+
+        # Only closed days are rolled up; the analytics endpoints read later days live
+        if end_date >= today:
+            self.stdout.write(
+                self.style.ERROR('Only days before today can be rolled up')
+            )
+            return
+
+        dates = [end_date - timedelta(days=offset) for offset in range(max(options['days'], 1))]
+        self.stdout.write(f'Rolling up session and analytics stats for {dates[-1]} to {dates[0]}')
+
+        # Days whose records changed after they were rolled up are redone too
+        stale_dates = unmarked_rollup_dates().difference(dates)
+        if stale_dates:
+            self.stdout.write(
+                'Rolling up again: ' + ', '.join(str(stale_date) for stale_date in sorted(stale_dates))
+            )
+        dates = set(dates) | stale_dates
+
+        session_rows = rebuild_daily_session_stats(dates)
+        analytics_rows = rebuild_daily_analytics_stats(dates)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Saved {session_rows} daily session stats rows and '
+                f'{analytics_rows} daily analytics stats rows'
+            )
+        )
@@ -1,13 +1,7 @@
 from django.core.management.base import BaseCommand
-from django.db.models import Sum, F
 from django.utils import timezone
-from django.core.cache import cache
-from decimal import Decimal
-import logging
 
-from game_ledger.models import GameAnalytics, DailyProfitStats
-
-logger = logging.getLogger(__name__)
+from game_ledger.profit import calculate_profit_percentages, save_profit_stats
 
 
 class Command(BaseCommand):
@@ -44,7 +38,7 @@ class Command(BaseCommand):
         # This ensures the cron job always updates with fresh data every 10 seconds
 
         # Calculate profit percentages by game type
-        profit_data = self.calculate_profit_percentages(target_date)
+        profit_data = calculate_profit_percentages(target_date)
 
         if not profit_data:
             self.stdout.write(
@@ -53,70 +47,11 @@ class Command(BaseCommand):
             # Still create/update record with empty data
             profit_data = {}
 
-        # Create or update record
-        record, created = DailyProfitStats.objects.update_or_create(
-            date=target_date,
-            defaults={'profit_data': profit_data}
-        )
-
-        # Clear cache to ensure fresh data on next API call
-        cache_key = 'daily_profit_stats_latest'
-        try:
-            cache.delete(cache_key)
-            self.stdout.write(f'Cache cleared for key: {cache_key}')
-        except Exception as cache_error:
-            self.stdout.write(
-                self.style.WARNING(f'Failed to clear cache: {cache_error}')
-            )
+        # Create or update record in a single upsert; this also clears the cached latest stats
+        save_profit_stats({target_date: profit_data})
 
-        action = 'Created' if created else 'Updated'
         self.stdout.write(
             self.style.SUCCESS(
-                f'{action} profit stats for {target_date}: {profit_data}'
+                f'Saved profit stats for {target_date}: {profit_data}'
             )
         )
-
-    def calculate_profit_percentages(self, target_date):
-        """
-        Calculate profit percentages for each game type for the given date.
-        Formula: ((total_stakes - total_payouts - commission) / total_stakes) * 100
-        Commission: 10% of total_stakes
-        """
-        # Query GameAnalytics for the target date, grouped by game_type
-        game_stats = (
-            GameAnalytics.objects
-            .filter(created_at__date=target_date)
-            .values('game_type')
-            .annotate(
-                total_stakes=Sum('stake_amount'),
-                total_payouts=Sum('winning_amount')
-            )
-            .filter(total_stakes__gt=0)  # Avoid division by zero
-        )
-
-        profit_data = {}
-
-        for stats in game_stats:
-            game_type = stats['game_type']
-            total_stakes = stats['total_stakes']
-            total_payouts = stats['total_payouts']
-
-            # Calculate commission (10% of total stakes)
-            commission = total_stakes * Decimal('0.10')
-
-            # Calculate house profit (stakes - payouts - commission)
-            house_profit = total_stakes - total_payouts - commission
-
-            # Calculate profit percentage
-            profit_percentage = (house_profit / total_stakes) * 100
-
-            # Round to 2 decimal places and convert to float for JSON storage
-            profit_data[game_type] = round(float(profit_percentage), 2)
-
-            logger.info(
-                f'Game type: {game_type}, Stakes: {total_stakes}, '
-                f'Payouts: {total_payouts}, Commission: {commission}, '
-                f'Profit %: {profit_data[game_type]}'
-            )
-
-        return profit_data
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-15 20:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("game_ledger", "0005_dailyprofitstats"),
+    ]
+
+    operations = [
+        # The composite index's leading created_at column serves the same queries
+        migrations.RemoveIndex(
+            model_name="gameanalytics",
+            name="game_ledger_created_0a5131_idx",
+        ),
+        migrations.AddIndex(
+            model_name="gameanalytics",
+            index=models.Index(
+                fields=["created_at", "game_type"], name="ga_created_gtype_idx"
+            ),
+        ),
+    ]
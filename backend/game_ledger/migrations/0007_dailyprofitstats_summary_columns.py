@@ -0,0 +1,47 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:02
+
+from django.db import migrations, models
+
+
+def backfill_summary_columns(apps, schema_editor):
+    DailyProfitStats = apps.get_model("game_ledger", "DailyProfitStats")
+    records = list(DailyProfitStats.objects.all())
+    for record in records:
+        profit_data = record.profit_data or {}
+        record.game_types_count = len(profit_data)
+        record.avg_profit = (
+            round(sum(profit_data.values()) / len(profit_data), 2)
+            if profit_data
+            else None
+        )
+    DailyProfitStats.objects.bulk_update(
+        records, ["avg_profit", "game_types_count"], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("game_ledger", "0006_gameanalytics_created_gtype_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dailyprofitstats",
+            name="avg_profit",
+            field=models.FloatField(
+                blank=True,
+                help_text="Average profit percentage across game types (denormalized from profit_data)",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="dailyprofitstats",
+            name="game_types_count",
+            field=models.PositiveSmallIntegerField(
+                default=0,
+                help_text="Number of game types in profit_data (denormalized from profit_data)",
+            ),
+        ),
+        migrations.RunPython(backfill_summary_columns, migrations.RunPython.noop),
+    ]
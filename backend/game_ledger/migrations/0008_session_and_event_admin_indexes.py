@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("game_ledger", "0007_dailyprofitstats_summary_columns"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="gameevent",
+            index=models.Index(
+                fields=["session", "timestamp"], name="gameevent_sess_ts_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="gameevent",
+            index=models.Index(
+                fields=["event_type", "timestamp"], name="gameevent_type_ts_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="gamesession",
+            index=models.Index(
+                fields=["status", "created_at"], name="gs_status_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="gamesession",
+            index=models.Index(fields=["user_id"], name="gs_user_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="gamesession",
+            index=models.Index(fields=["username"], name="gs_username_idx"),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:03
+
+from django.db import migrations, models
+import game_ledger.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("game_ledger", "0008_session_and_event_admin_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="gameanalytics",
+            name="id",
+            field=models.UUIDField(
+                default=game_ledger.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="gameevent",
+            name="id",
+            field=models.UUIDField(
+                default=game_ledger.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="gamesession",
+            name="id",
+            field=models.UUIDField(
+                default=game_ledger.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+    ]
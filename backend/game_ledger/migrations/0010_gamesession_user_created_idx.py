@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("game_ledger", "0009_time_ordered_uuid_primary_keys"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="gamesession",
+            name="gs_user_id_idx",
+        ),
+        migrations.AddIndex(
+            model_name="gamesession",
+            index=models.Index(
+                fields=["user_id", "-created_at"], name="gs_user_created_idx"
+            ),
+        ),
+    ]
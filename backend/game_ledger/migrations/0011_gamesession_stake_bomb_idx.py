@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("game_ledger", "0010_gamesession_user_created_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="gamesession",
+            index=models.Index(
+                fields=["stake", "bomb_probability"], name="gs_stake_bomb_idx"
+            ),
+        ),
+    ]
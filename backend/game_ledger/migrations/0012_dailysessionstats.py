@@ -0,0 +1,84 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("game_ledger", "0011_gamesession_stake_bomb_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailySessionStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "date",
+                    models.DateField(help_text="Day the sessions were created on"),
+                ),
+                (
+                    "stake",
+                    models.DecimalField(
+                        decimal_places=2,
+                        help_text="Amount wagered per session",
+                        max_digits=12,
+                    ),
+                ),
+                (
+                    "bomb_probability",
+                    models.FloatField(help_text="Probability of bombs as percentage"),
+                ),
+                ("total_sessions", models.PositiveIntegerField(default=0)),
+                ("cashed_out", models.PositiveIntegerField(default=0)),
+                ("bomb_hits", models.PositiveIntegerField(default=0)),
+                (
+                    "total_stakes",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "total_payouts",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "cashed_out_winnings",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        help_text="Sum of total_winnings over cashed out sessions",
+                        max_digits=14,
+                    ),
+                ),
+                (
+                    "winnings_count",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Number of cashed out sessions with recorded winnings",
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Daily Session Stats",
+                "verbose_name_plural": "Daily Session Stats",
+                "db_table": "game_ledger_daily_session_stats",
+                "ordering": ["-date"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="dailysessionstats",
+            constraint=models.UniqueConstraint(
+                fields=("date", "stake", "bomb_probability"),
+                name="daily_session_stats_unique",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("game_ledger", "0012_dailysessionstats"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="gamesession",
+            name="gs_stake_bomb_idx",
+        ),
+        migrations.AddIndex(
+            model_name="gamesession",
+            index=models.Index(
+                fields=["stake", "bomb_probability", "created_at"],
+                name="gs_stake_bomb_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:12
+
+from django.db import migrations, models
+from django.db.models import F
+import game_ledger.models
+
+
+def copy_ids_to_public_id(apps, schema_editor):
+    """Keep every existing event's UUID as its public identifier"""
+    GameEvent = apps.get_model("game_ledger", "GameEvent")
+    GameEvent.objects.update(public_id=F("id"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("game_ledger", "0013_gamesession_stake_bomb_created_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="gameevent",
+            name="public_id",
+            field=models.UUIDField(editable=False, null=True),
+        ),
+        migrations.RunPython(copy_ids_to_public_id, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="gameevent",
+            name="public_id",
+            field=models.UUIDField(
+                default=game_ledger.models.uuid7, editable=False, unique=True
+            ),
+        ),
+        # UUIDs can't be cast to integers, so the key column is replaced
+        # rather than altered; existing events are numbered on the way
+        migrations.RemoveField(
+            model_name="gameevent",
+            name="id",
+        ),
+        migrations.AddField(
+            model_name="gameevent",
+            name="id",
+            field=models.BigAutoField(
+                auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+            ),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:12
+
+import re
+
+from django.db import migrations, models
+
+
+# Same form the API accepts (serializers.CELL_POSITION_RE)
+CELL_POSITION_RE = re.compile(r"(\d{1,2})-(\d{1,2})", re.ASCII)
+BATCH_SIZE = 1000
+
+
+def split_cell_positions(apps, schema_editor):
+    GameEvent = apps.get_model("game_ledger", "GameEvent")
+    events = (
+        GameEvent.objects.exclude(cell_position__isnull=True)
+        .exclude(cell_position="")
+        .only("id", "cell_position")
+        .order_by()
+    )
+
+    batch = []
+    invalid_count, invalid_examples = 0, []
+    for event in events.iterator(chunk_size=BATCH_SIZE):
+        match = CELL_POSITION_RE.fullmatch(event.cell_position)
+        if not match:
+            invalid_count += 1
+            if len(invalid_examples) < 20:
+                invalid_examples.append(f"{event.id}: {event.cell_position!r}")
+            continue
+        event.cell_row, event.cell_col = int(match[1]), int(match[2])
+        batch.append(event)
+        if len(batch) == BATCH_SIZE:
+            GameEvent.objects.bulk_update(batch, ["cell_row", "cell_col"])
+            batch = []
+    GameEvent.objects.bulk_update(batch, ["cell_row", "cell_col"])
+
+    # 0016 drops cell_position, so roll back rather than lose positions that don't parse
+    if invalid_count:
+        raise ValueError(
+            f"{invalid_count} GameEvent rows have a cell_position that isn't in 'row-col' "
+            f"form (e.g. {', '.join(invalid_examples)}). Fix or clear them, then migrate again."
+        )
+
+
+def join_cell_positions(apps, schema_editor):
+    GameEvent = apps.get_model("game_ledger", "GameEvent")
+    events = (
+        GameEvent.objects.filter(cell_row__isnull=False, cell_col__isnull=False)
+        .only("id", "cell_row", "cell_col")
+        .order_by()
+    )
+    batch = []
+    for event in events.iterator(chunk_size=BATCH_SIZE):
+        event.cell_position = f"{event.cell_row}-{event.cell_col}"
+        batch.append(event)
+        if len(batch) == BATCH_SIZE:
+            GameEvent.objects.bulk_update(batch, ["cell_position"])
+            batch = []
+    GameEvent.objects.bulk_update(batch, ["cell_position"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("game_ledger", "0014_gameevent_bigint_pk"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="gameevent",
+            name="cell_col",
+            field=models.PositiveSmallIntegerField(
+                blank=True, help_text="Grid column of flipped card", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="gameevent",
+            name="cell_row",
+            field=models.PositiveSmallIntegerField(
+                blank=True, help_text="Grid row of flipped card", null=True
+            ),
+        ),
+        migrations.RunPython(split_cell_positions, join_cell_positions),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:12
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("game_ledger", "0015_gameevent_cell_row_col"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="gameevent",
+            name="cell_position",
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:14
+
+from django.db import migrations, models
+from django.db.models.functions import Round
+
+
+def round_bomb_probabilities(apps, schema_editor):
+    """Round stored percentages so the integer columns receive exact values"""
+    GameSession = apps.get_model("game_ledger", "GameSession")
+    DailySessionStats = apps.get_model("game_ledger", "DailySessionStats")
+
+    GameSession.objects.exclude(bomb_probability=Round("bomb_probability")).update(
+        bomb_probability=Round("bomb_probability")
+    )
+
+    # Rollups are rebuilt from the sessions; rows under a fractional rate are
+    # dropped, and their days are aggregated live until rolled up again
+    DailySessionStats.objects.exclude(bomb_probability=Round("bomb_probability")).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("game_ledger", "0016_remove_gameevent_cell_position"),
+    ]
+
+    operations = [
+        migrations.RunPython(round_bomb_probabilities, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="dailysessionstats",
+            name="bomb_probability",
+            field=models.PositiveSmallIntegerField(
+                help_text="Probability of bombs as a whole percentage"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="gamesession",
+            name="bomb_probability",
+            field=models.PositiveSmallIntegerField(
+                help_text="Probability of bombs as a whole percentage (e.g., 20 for 20%)"
+            ),
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:15
+
+from django.db import migrations, models
+from django.db.models import Case, Value, When
+
+# Old string statuses and their new integer codes
+STATUS_CODES = {"ACTIVE": 0, "CASHED_OUT": 1, "BOMB_HIT": 2}
+
+
+def encode_statuses(apps, schema_editor):
+    GameSession = apps.get_model("game_ledger", "GameSession")
+    GameSession.objects.update(
+        status_code=Case(
+            *[
+                When(status=name, then=Value(code))
+                for name, code in STATUS_CODES.items()
+            ],
+            default=Value(0),
+        )
+    )
+
+
+def decode_statuses(apps, schema_editor):
+    GameSession = apps.get_model("game_ledger", "GameSession")
+    GameSession.objects.update(
+        status=Case(
+            *[
+                When(status_code=code, then=Value(name))
+                for name, code in STATUS_CODES.items()
+            ],
+            default=Value("ACTIVE"),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("game_ledger", "0017_bomb_probability_whole_percent"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="gamesession",
+            name="status_code",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.RunPython(encode_statuses, decode_statuses),
+        migrations.RemoveIndex(
+            model_name="gamesession",
+            name="gs_status_created_idx",
+        ),
+        migrations.RemoveField(
+            model_name="gamesession",
+            name="status",
+        ),
+        migrations.RenameField(
+            model_name="gamesession",
+            old_name="status_code",
+            new_name="status",
+        ),
+        migrations.AlterField(
+            model_name="gamesession",
+            name="status",
+            field=models.PositiveSmallIntegerField(
+                choices=[(0, "Active"), (1, "Cashed Out"), (2, "Bomb Hit")],
+                default=0,
+                help_text="Current status of the game session",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="gamesession",
+            index=models.Index(
+                fields=["status", "created_at"], name="gs_status_created_idx"
+            ),
+        ),
+    ]
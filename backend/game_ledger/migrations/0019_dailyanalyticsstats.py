@@ -0,0 +1,80 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("game_ledger", "0018_gamesession_integer_status"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyAnalyticsStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(help_text="Day the records were created on")),
+                (
+                    "game_type",
+                    models.CharField(
+                        help_text="Type/variant of the game", max_length=50
+                    ),
+                ),
+                (
+                    "bomb_rate",
+                    models.IntegerField(help_text="Bomb rate percentage used"),
+                ),
+                ("total_sessions", models.PositiveIntegerField(default=0)),
+                ("wins", models.PositiveIntegerField(default=0)),
+                ("losses", models.PositiveIntegerField(default=0)),
+                ("perfect_games", models.PositiveIntegerField(default=0)),
+                (
+                    "total_stakes",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "total_payouts",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "multiplier_sum",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        help_text="Sum of multipliers, for averaging across days",
+                        max_digits=14,
+                    ),
+                ),
+                (
+                    "cards_flipped_sum",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Sum of cards flipped, for averaging across days",
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Daily Analytics Stats",
+                "verbose_name_plural": "Daily Analytics Stats",
+                "db_table": "game_ledger_daily_analytics_stats",
+                "ordering": ["-date"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="dailyanalyticsstats",
+            constraint=models.UniqueConstraint(
+                fields=("date", "game_type", "bomb_rate"),
+                name="daily_analytics_stats_unique",
+            ),
+        ),
+    ]
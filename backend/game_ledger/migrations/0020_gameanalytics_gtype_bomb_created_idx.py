@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("game_ledger", "0019_dailyanalyticsstats"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="gameanalytics",
+            name="game_ledger_game_ty_78f75d_idx",
+        ),
+        migrations.AddIndex(
+            model_name="gameanalytics",
+            index=models.Index(
+                fields=["game_type", "bomb_rate", "created_at"],
+                name="ga_gtype_bomb_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-15 21:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("game_ledger", "0020_gameanalytics_gtype_bomb_created_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("sessions", "Daily Session Stats"),
+                            ("analytics", "Daily Analytics Stats"),
+                        ],
+                        help_text="Rollup table the day was written to",
+                        max_length=20,
+                    ),
+                ),
+                ("date", models.DateField(help_text="Day that was rolled up")),
+                ("rolled_up_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Daily Rollup",
+                "verbose_name_plural": "Daily Rollups",
+                "db_table": "game_ledger_daily_rollup",
+                "ordering": ["-date"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="dailyrollup",
+            constraint=models.UniqueConstraint(
+                fields=("kind", "date"), name="daily_rollup_unique"
+            ),
+        ),
+    ]
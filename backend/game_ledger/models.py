@@ -1,18 +1,49 @@
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Coalesce, Now
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
 from django.utils import timezone
+import os
+import time
 import uuid
 
 
+def uuid7():
+    """
+    Generate a time-ordered version 7 UUID: a 48-bit Unix millisecond timestamp
+    followed by random bits, so new primary keys land at the end of the b-tree.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    value = value & ~(0xF << 76) | 0x7 << 76  # version 7
+    value = value & ~(0x3 << 62) | 0x2 << 62  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
+class GameSessionQuerySet(models.QuerySet):
+    """QuerySet helpers for bulk game session state changes"""
+
+    def end(self, status, **fields):
+        """
+        Move the sessions to a terminal status with a single UPDATE,
+        stamping ended_at in the database where it isn't set yet.
+        Returns the number of rows updated.
+        """
+        return self.update(status=status, ended_at=Coalesce(F('ended_at'), Now()), **fields)
+
+
 class GameSession(models.Model):
     """Model to track individual game sessions"""
 
-    STATUS_CHOICES = [
-        ('ACTIVE', 'Active'),
-        ('CASHED_OUT', 'Cashed Out'),
-        ('BOMB_HIT', 'Bomb Hit'),
-    ]
+    class Status(models.IntegerChoices):
+        """Stored as a small integer; the API exposes the member name (e.g. 'CASHED_OUT')"""
+        ACTIVE = 0, 'Active'
+        CASHED_OUT = 1, 'Cashed Out'
+        BOMB_HIT = 2, 'Bomb Hit'
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    TERMINAL_STATUSES = (Status.CASHED_OUT, Status.BOMB_HIT)
+
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     user_id = models.CharField(max_length=100, help_text="Unique identifier for the player")
     username = models.CharField(max_length=50, help_text="Display name for the player")
     starting_balance = models.DecimalField(
@@ -26,11 +57,10 @@ class GameSession(models.Model):
         help_text="Amount wagered for this game"
     )
     grid_size = models.IntegerField(help_text="Size of the game grid (e.g., 5 for 5x5)")
-    bomb_probability = models.FloatField(help_text="Probability of bombs as percentage (e.g., 20.0 for 20%)")
-    status = models.CharField(
-        max_length=20,
-        choices=STATUS_CHOICES,
-        default='ACTIVE',
+    bomb_probability = models.PositiveSmallIntegerField(help_text="Probability of bombs as a whole percentage (e.g., 20 for 20%)")
+    status = models.PositiveSmallIntegerField(
+        choices=Status.choices,
+        default=Status.ACTIVE,
         help_text="Current status of the game session"
     )
     total_winnings = models.DecimalField(
@@ -50,19 +80,33 @@ class GameSession(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     ended_at = models.DateTimeField(null=True, blank=True, help_text="When the game ended")
 
+    objects = GameSessionQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         verbose_name = "Game Session"
         verbose_name_plural = "Game Sessions"
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='gs_status_created_idx'),
+            models.Index(fields=['user_id', '-created_at'], name='gs_user_created_idx'),
+            models.Index(fields=['username'], name='gs_username_idx'),
+            models.Index(fields=['stake', 'bomb_probability', 'created_at'], name='gs_stake_bomb_created_idx'),
+        ]
 
     def __str__(self):
-        return f"Game {self.id} - {self.username} ({self.status})"
+        return f"Game {self.id} - {self.username} ({self.status_name})"
+
+    @property
+    def status_name(self):
+        """Status as the string used by the API, e.g. 'CASHED_OUT'"""
+        return self.Status(self.status).name
 
-    def save(self, *args, **kwargs):
-        # Auto-set ended_at when status changes to terminal state
-        if self.status in ['CASHED_OUT', 'BOMB_HIT'] and not self.ended_at:
-            self.ended_at = timezone.now()
-        super().save(*args, **kwargs)
+
+@receiver(pre_save, sender=GameSession)
+def stamp_session_ended_at(sender, instance, **kwargs):
+    """Auto-set ended_at when a saved session reaches a terminal state"""
+    if instance.ended_at is None and instance.status in GameSession.TERMINAL_STATUSES:
+        instance.ended_at = timezone.now()
 
 
 class GameEvent(models.Model):
@@ -74,8 +118,15 @@ class GameEvent(models.Model):
         ('CASHOUT', 'Cash Out'),
         ('BOMB_HIT', 'Bomb Hit'),
     ]
+    # Events that end their session, mapped to the status they leave it in
+    TERMINAL_EVENT_TYPES = {
+        'CASHOUT': GameSession.Status.CASHED_OUT,
+        'BOMB_HIT': GameSession.Status.BOMB_HIT,
+    }
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Events are append-only, so they keep the default sequential primary key
+    # and expose this UUID through the API instead
+    public_id = models.UUIDField(default=uuid7, unique=True, editable=False)
     session = models.ForeignKey(
         GameSession,
         on_delete=models.CASCADE,
@@ -106,11 +157,15 @@ class GameEvent(models.Model):
         blank=True,
         help_text="Current multiplier at time of event"
     )
-    cell_position = models.CharField(
-        max_length=10,
+    cell_row = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        help_text="Grid row of flipped card"
+    )
+    cell_col = models.PositiveSmallIntegerField(
         null=True,
         blank=True,
-        help_text="Grid position of flipped card (e.g., '2-3')"
+        help_text="Grid column of flipped card"
     )
     timestamp = models.DateTimeField(auto_now_add=True)
 
@@ -118,15 +173,30 @@ class GameEvent(models.Model):
         ordering = ['timestamp']
         verbose_name = "Game Event"
         verbose_name_plural = "Game Events"
+        indexes = [
+            models.Index(fields=['session', 'timestamp'], name='gameevent_sess_ts_idx'),
+            models.Index(fields=['event_type', 'timestamp'], name='gameevent_type_ts_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.event_type} - {self.session.username}"
+        # Only show the username when the session is already loaded, so
+        # rendering a list of events never issues a query per row
+        if GameEvent.session.is_cached(self):
+            return f"{self.event_type} - {self.session.username}"
+        return f"{self.event_type} - {self.session_id}"
+
+    @property
+    def cell_position(self):
+        """Grid position in the 'row-col' form used by the API (e.g., '2-3')"""
+        if self.cell_row is None or self.cell_col is None:
+            return None
+        return f"{self.cell_row}-{self.cell_col}"
 
 
 class GameAnalytics(models.Model):
     """Model to track individual game records for analytics (separate from session tracking)"""
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     game_type = models.CharField(
         max_length=50,
         help_text="Type/variant of the game (e.g., 'bomb_flip', 'classic', etc.)"
@@ -183,9 +253,9 @@ class GameAnalytics(models.Model):
         verbose_name = "Game Analytics Record"
         verbose_name_plural = "Game Analytics Records"
         indexes = [
-            models.Index(fields=['game_type', 'bomb_rate']),
-            models.Index(fields=['created_at']),
+            models.Index(fields=['game_type', 'bomb_rate', 'created_at'], name='ga_gtype_bomb_created_idx'),
             models.Index(fields=['game_type', 'created_at']),
+            models.Index(fields=['created_at', 'game_type'], name='ga_created_gtype_idx'),
         ]
 
     def __str__(self):
@@ -208,6 +278,15 @@ class DailyProfitStats(models.Model):
     profit_data = models.JSONField(
         help_text="Profit percentages by game type, e.g., {'bomb_flip': 20.5, 'quick_cash': 15.3}"
     )
+    avg_profit = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Average profit percentage across game types (denormalized from profit_data)"
+    )
+    game_types_count = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Number of game types in profit_data (denormalized from profit_data)"
+    )
     created_at = models.DateTimeField(
         auto_now_add=True,
         help_text="When this record was first created"
@@ -228,3 +307,121 @@ class DailyProfitStats(models.Model):
 
     def __str__(self):
         return f"Profit Stats for {self.date}"
+
+    @staticmethod
+    def summarize(profit_data):
+        """Return the denormalized summary columns for a profit_data dict"""
+        return {
+            'avg_profit': round(sum(profit_data.values()) / len(profit_data), 2) if profit_data else None,
+            'game_types_count': len(profit_data),
+        }
+
+
+class DailySessionStats(models.Model):
+    """Pre-aggregated daily GameSession statistics per (stake, bomb probability) combination"""
+
+    date = models.DateField(help_text="Day the sessions were created on")
+    stake = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        help_text="Amount wagered per session"
+    )
+    bomb_probability = models.PositiveSmallIntegerField(help_text="Probability of bombs as a whole percentage")
+    total_sessions = models.PositiveIntegerField(default=0)
+    cashed_out = models.PositiveIntegerField(default=0)
+    bomb_hits = models.PositiveIntegerField(default=0)
+    total_stakes = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_payouts = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    cashed_out_winnings = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        help_text="Sum of total_winnings over cashed out sessions"
+    )
+    winnings_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of cashed out sessions with recorded winnings"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'game_ledger_daily_session_stats'
+        verbose_name = "Daily Session Stats"
+        verbose_name_plural = "Daily Session Stats"
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'stake', 'bomb_probability'],
+                name='daily_session_stats_unique'
+            ),
+        ]
+
+    def __str__(self):
+        return f"Session Stats for {self.date} ({self.stake}/{self.bomb_probability}%)"
+
+
+class DailyAnalyticsStats(models.Model):
+    """Pre-aggregated daily GameAnalytics statistics per (game type, bomb rate) combination"""
+
+    date = models.DateField(help_text="Day the records were created on")
+    game_type = models.CharField(max_length=50, help_text="Type/variant of the game")
+    bomb_rate = models.IntegerField(help_text="Bomb rate percentage used")
+    total_sessions = models.PositiveIntegerField(default=0)
+    wins = models.PositiveIntegerField(default=0)
+    losses = models.PositiveIntegerField(default=0)
+    perfect_games = models.PositiveIntegerField(default=0)
+    total_stakes = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_payouts = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    multiplier_sum = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        help_text="Sum of multipliers, for averaging across days"
+    )
+    cards_flipped_sum = models.PositiveIntegerField(
+        default=0,
+        help_text="Sum of cards flipped, for averaging across days"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'game_ledger_daily_analytics_stats'
+        verbose_name = "Daily Analytics Stats"
+        verbose_name_plural = "Daily Analytics Stats"
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'game_type', 'bomb_rate'],
+                name='daily_analytics_stats_unique'
+            ),
+        ]
+
+    def __str__(self):
+        return f"Analytics Stats for {self.date} ({self.game_type}/{self.bomb_rate}%)"
+
+
+class DailyRollup(models.Model):
+    """
+    Marks a day whose statistics have been rolled up. Readers take marked days
+    from the rollup tables and scan the raw records for every other day.
+    """
+
+    class Kind(models.TextChoices):
+        SESSIONS = 'sessions', 'Daily Session Stats'
+        ANALYTICS = 'analytics', 'Daily Analytics Stats'
+
+    kind = models.CharField(max_length=20, choices=Kind.choices, help_text="Rollup table the day was written to")
+    date = models.DateField(help_text="Day that was rolled up")
+    rolled_up_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'game_ledger_daily_rollup'
+        verbose_name = "Daily Rollup"
+        verbose_name_plural = "Daily Rollups"
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'date'], name='daily_rollup_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} rolled up for {self.date}"
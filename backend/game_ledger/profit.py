@@ -0,0 +1,133 @@
+"""
+Daily profit calculations shared by the calculate_daily_profit command
+and the DailyProfitStats admin actions.
+"""
+from django.core.cache import cache
+from django.db.models import Sum, Q, ExpressionWrapper, FloatField
+from django.db.models.functions import TruncDate
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+import logging
+
+from .models import GameAnalytics, DailyProfitStats
+
+logger = logging.getLogger(__name__)
+
+# Commission taken by the house on every stake
+COMMISSION_RATE = Decimal('0.10')
+
+# Cache key and TTL of the latest DailyProfitStats payload served by current_profit_stats
+LATEST_PROFIT_CACHE_KEY = 'daily_profit_stats_latest'
+LATEST_PROFIT_CACHE_TIMEOUT = 30
+
+
+def day_bounds(target_date):
+    """
+    Return the half-open [start, end) datetime range covering target_date.
+    Filtering on this range instead of created_at__date keeps the
+    (created_at, game_type) index usable.
+    """
+    start = timezone.make_aware(datetime.combine(target_date, time.min))
+    return start, start + timedelta(days=1)
+
+
+def _profit_stats(records, *group_by):
+    """Group records and compute stakes, payouts and profit percentage in the database"""
+    return (
+        records
+        .values(*group_by)
+        .annotate(
+            total_stakes=Sum('stake_amount'),
+            total_payouts=Sum('winning_amount'),
+            profit_percentage=ExpressionWrapper(
+                (Sum('stake_amount') * (1 - COMMISSION_RATE) - Sum('winning_amount'))
+                * 100 / Sum('stake_amount'),
+                output_field=FloatField()
+            )
+        )
+        .filter(total_stakes__gt=0)  # Avoid division by zero
+    )
+
+
+def aggregate_profit_percentages(day_records):
+    """Aggregate profit percentages by game type for one day's records"""
+    profit_data = {}
+
+    for stats in _profit_stats(day_records, 'game_type'):
+        game_type = stats['game_type']
+
+        # Round to 2 decimal places for JSON storage
+        profit_data[game_type] = round(stats['profit_percentage'], 2)
+
+        logger.info(
+            f'Game type: {game_type}, Stakes: {stats["total_stakes"]}, '
+            f'Payouts: {stats["total_payouts"]}, '
+            f'Profit %: {profit_data[game_type]}'
+        )
+
+    return profit_data
+
+
+def calculate_profit_percentages(target_date):
+    """
+    Calculate profit percentages for each game type for the given date.
+    Formula: ((total_stakes - total_payouts - commission) / total_stakes) * 100
+    Commission: 10% of total_stakes
+    """
+    start, end = day_bounds(target_date)
+    day_records = GameAnalytics.objects.filter(created_at__gte=start, created_at__lt=end)
+
+    # Cheap index probe for days without games, e.g. a run just after midnight
+    if not day_records.exists():
+        return {}
+
+    return aggregate_profit_percentages(day_records)
+
+
+def calculate_profit_percentages_for_dates(dates):
+    """
+    Calculate profit percentages for several dates with a single GROUP BY query.
+    Returns {date: {game_type: profit_percentage}}; dates without games map to {}.
+    """
+    profit_by_date = {target_date: {} for target_date in dates}
+    if not profit_by_date:
+        return profit_by_date
+
+    day_ranges = Q()
+    for target_date in profit_by_date:
+        start, end = day_bounds(target_date)
+        day_ranges |= Q(created_at__gte=start, created_at__lt=end)
+
+    records = GameAnalytics.objects.filter(day_ranges).annotate(day=TruncDate('created_at'))
+    for stats in _profit_stats(records, 'day', 'game_type'):
+        profit_by_date[stats['day']][stats['game_type']] = round(stats['profit_percentage'], 2)
+
+    return profit_by_date
+
+
+def save_profit_stats(profit_by_date):
+    """
+    Upsert DailyProfitStats rows for {date: profit_data} in a single INSERT ... ON CONFLICT.
+    bulk_create doesn't send post_save, so the cached latest payload is dropped here.
+    """
+    records = [
+        DailyProfitStats(date=target_date, profit_data=profit_data, **DailyProfitStats.summarize(profit_data))
+        for target_date, profit_data in profit_by_date.items()
+    ]
+    saved = DailyProfitStats.objects.bulk_create(
+        records,
+        update_conflicts=True,
+        unique_fields=['date'],
+        update_fields=['profit_data', 'avg_profit', 'game_types_count', 'updated_at']
+    )
+    cache.delete(LATEST_PROFIT_CACHE_KEY)
+    return saved
+
+
+@receiver([post_save, post_delete], sender=DailyProfitStats)
+def invalidate_latest_profit_stats(sender, **kwargs):
+    """Drop the cached latest payload when a row is edited or deleted, e.g. in the admin"""
+    cache.delete(LATEST_PROFIT_CACHE_KEY)
@@ -0,0 +1,34 @@
+"""
+orjson-backed DRF renderer and plain Django response; both serialize UUIDs,
+datetimes and nested dicts in C instead of through the stdlib json encoder.
+"""
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+import orjson
+
+# Options shared with the analytics views that build JSON by hand
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_UUID
+
+
+def dumps(data):
+    """Serialize to JSON bytes; anything orjson doesn't know (e.g. Decimal) becomes a string"""
+    return orjson.dumps(data, default=str, option=ORJSON_OPTIONS)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """Drop-in replacement for rest_framework.renderers.JSONRenderer"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return dumps(data)
+
+
+class ORJSONResponse(HttpResponse):
+    """JSON response for plain Django views; data may also be already serialized bytes"""
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        if not isinstance(data, bytes):
+            data = dumps(data)
+        super().__init__(data, **kwargs)
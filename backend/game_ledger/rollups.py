@@ -0,0 +1,268 @@
+"""
+Daily rollups of GameSession and GameAnalytics statistics.
+
+DailySessionStats and DailyAnalyticsStats rows hold additive sufficient
+statistics (counts and sums) per day and combination, so any date range can
+be answered by summing rows instead of scanning the underlying records.
+A DailyRollup marker records every day that was rolled up; all other days,
+including ones the command hasn't reached yet, are aggregated live.
+"""
+from django.db import transaction
+from django.db.models import Count, Sum, Q
+from django.db.models.functions import TruncDate
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from collections import defaultdict
+from datetime import timedelta
+from itertools import chain
+
+from .models import GameSession, GameAnalytics, DailySessionStats, DailyAnalyticsStats, DailyRollup
+from .profit import day_bounds
+
+# Statistics stored per combination; every one of them is additive across days
+SESSION_STAT_FIELDS = (
+    'total_sessions', 'cashed_out', 'bomb_hits', 'total_stakes',
+    'total_payouts', 'cashed_out_winnings', 'winnings_count',
+)
+ANALYTICS_STAT_FIELDS = (
+    'total_sessions', 'wins', 'losses', 'perfect_games', 'total_stakes',
+    'total_payouts', 'multiplier_sum', 'cards_flipped_sum',
+)
+
+
+def session_stat_aggregates():
+    """Aggregates producing SESSION_STAT_FIELDS from a GameSession queryset"""
+    return {
+        'total_sessions': Count('id'),
+        'cashed_out': Count('id', filter=Q(status=GameSession.Status.CASHED_OUT)),
+        'bomb_hits': Count('id', filter=Q(status=GameSession.Status.BOMB_HIT)),
+        'total_stakes': Sum('stake'),
+        'total_payouts': Sum('total_winnings'),
+        'cashed_out_winnings': Sum('total_winnings', filter=Q(status=GameSession.Status.CASHED_OUT)),
+        'winnings_count': Count('total_winnings', filter=Q(status=GameSession.Status.CASHED_OUT)),
+    }
+
+
+def analytics_stat_aggregates():
+    """Aggregates producing ANALYTICS_STAT_FIELDS from a GameAnalytics queryset"""
+    return {
+        'total_sessions': Count('id'),
+        'wins': Count('id', filter=Q(game_outcome='WIN')),
+        'losses': Count('id', filter=Q(game_outcome='LOSS')),
+        'perfect_games': Count('id', filter=Q(game_outcome='PERFECT')),
+        'total_stakes': Sum('stake_amount'),
+        'total_payouts': Sum('winning_amount'),
+        'multiplier_sum': Sum('multiplier'),
+        'cards_flipped_sum': Sum('cards_flipped'),
+    }
+
+
+def _rebuild(source, rollup_model, kind, combo_fields, aggregates, stat_fields, dates):
+    """
+    Recompute rollup_model rows for the given (closed) dates with one GROUP BY
+    query over source, replace the stored rows and mark the dates as rolled up.
+    Returns the number of rows written.
+    """
+    dates = set(dates)
+    if not dates:
+        return 0
+
+    day_ranges = Q()
+    for target_date in dates:
+        start, end = day_bounds(target_date)
+        day_ranges |= Q(created_at__gte=start, created_at__lt=end)
+
+    rows = (
+        source.objects
+        .filter(day_ranges)
+        .annotate(day=TruncDate('created_at'))
+        .order_by()
+        .values('day', *combo_fields)
+        .annotate(**aggregates)
+    )
+    records = [
+        rollup_model(
+            date=row['day'],
+            **{field: row[field] for field in combo_fields},
+            **{field: row[field] or 0 for field in stat_fields}
+        )
+        for row in rows
+    ]
+
+    with transaction.atomic():
+        rollup_model.objects.filter(date__in=dates).delete()
+        rollup_model.objects.bulk_create(records)
+        DailyRollup.objects.bulk_create(
+            [DailyRollup(kind=kind, date=target_date) for target_date in dates],
+            ignore_conflicts=True
+        )
+
+    return len(records)
+
+
+def rebuild_daily_session_stats(dates):
+    """Recompute the DailySessionStats rows for the given (closed) dates"""
+    return _rebuild(
+        GameSession, DailySessionStats, DailyRollup.Kind.SESSIONS, ('stake', 'bomb_probability'),
+        session_stat_aggregates(), SESSION_STAT_FIELDS, dates
+    )
+
+
+def rebuild_daily_analytics_stats(dates):
+    """Recompute the DailyAnalyticsStats rows for the given (closed) dates"""
+    return _rebuild(
+        GameAnalytics, DailyAnalyticsStats, DailyRollup.Kind.ANALYTICS, ('game_type', 'bomb_rate'),
+        analytics_stat_aggregates(), ANALYTICS_STAT_FIELDS, dates
+    )
+
+
+def unmark_session_days(sessions):
+    """
+    Drop the rolled-up marker of the days the given sessions were created on,
+    e.g. when they end after their day was rolled up. Those days are read
+    live until aggregate_daily_stats rolls them up again.
+    """
+    session_days = sessions.annotate(day=TruncDate('created_at')).order_by().values('day')
+    DailyRollup.objects.filter(kind=DailyRollup.Kind.SESSIONS, date__in=session_days).delete()
+
+
+# Rollup fed by each source model
+_ROLLUP_KINDS = {
+    GameSession: DailyRollup.Kind.SESSIONS,
+    GameAnalytics: DailyRollup.Kind.ANALYTICS,
+}
+
+
+@receiver([post_save, post_delete], sender=GameSession)
+@receiver([post_save, post_delete], sender=GameAnalytics)
+def unmark_edited_record_day(sender, instance, created=False, **kwargs):
+    """Records saved or deleted one at a time, e.g. in the admin, make their day's rollup stale"""
+    if created:
+        # New records land on today, which is never rolled up
+        return
+    DailyRollup.objects.filter(
+        kind=_ROLLUP_KINDS[sender], date=timezone.localdate(instance.created_at)
+    ).delete()
+
+
+def unmarked_rollup_dates():
+    """Days that have rollup rows but lost their marker, so they need rolling up again"""
+    session_dates = DailySessionStats.objects.exclude(
+        date__in=DailyRollup.objects.filter(kind=DailyRollup.Kind.SESSIONS).values('date')
+    ).values_list('date', flat=True)
+    analytics_dates = DailyAnalyticsStats.objects.exclude(
+        date__in=DailyRollup.objects.filter(kind=DailyRollup.Kind.ANALYTICS).values('date')
+    ).values_list('date', flat=True)
+    return set(session_dates.distinct()) | set(analytics_dates.distinct())
+
+
+def _date_runs(dates):
+    """Group sorted dates into (first, last) runs of consecutive days"""
+    runs = []
+    for day in dates:
+        if runs and day == runs[-1][1] + timedelta(days=1):
+            runs[-1][1] = day
+        else:
+            runs.append([day, day])
+    return runs
+
+
+def _stats_by_combo(records, rollup_rows, kind, combo_fields, aggregates, stat_fields, start, end=None):
+    """
+    Return {combo: {stat: total}} for records created in [start, end] (end
+    inclusive, open-ended if None). Whole days marked as rolled up are summed
+    from rollup_rows; every other day, including partial days at either end
+    and today, is aggregated from records live.
+    """
+    first_full_day = timezone.localdate(start)
+    if day_bounds(first_full_day)[0] < start:
+        first_full_day += timedelta(days=1)
+
+    rolled_up = DailyRollup.objects.filter(kind=kind, date__gte=first_full_day)
+    if end is not None:
+        # The day end falls on is never fully covered, so it is read live
+        rolled_up = rolled_up.filter(date__lt=timezone.localdate(end))
+    runs = _date_runs(rolled_up.order_by('date').values_list('date', flat=True))
+
+    # Live ranges are the gaps between rolled-up runs, so each one stays an index range scan
+    rolled_days = Q()
+    live_ranges = Q()
+    live_start = start
+    for first, last in runs:
+        rolled_days |= Q(date__gte=first, date__lte=last)
+        live_ranges |= Q(created_at__gte=live_start, created_at__lt=day_bounds(first)[0])
+        live_start = day_bounds(last)[1]
+    live_ranges |= Q(created_at__gte=live_start)
+
+    records = records.filter(live_ranges)
+    if end is not None:
+        records = records.filter(created_at__lte=end)
+
+    rolled_rows = []
+    if runs:
+        rolled_rows = (
+            rollup_rows
+            .filter(rolled_days)
+            .order_by()
+            .values(*combo_fields)
+            .annotate(**{field: Sum(field) for field in stat_fields})
+        )
+    live_rows = (
+        records
+        .order_by()
+        .values(*combo_fields)
+        .annotate(**aggregates)
+    )
+
+    totals = defaultdict(lambda: dict.fromkeys(stat_fields, 0))
+    for row in chain(rolled_rows, live_rows):
+        combo_totals = totals[tuple(row[field] for field in combo_fields)]
+        for field in stat_fields:
+            combo_totals[field] += row[field] or 0
+    return totals
+
+
+def session_stats_by_combo(start, stakes=None, bomb_probabilities=None):
+    """
+    Return {(stake, bomb_probability): {stat: total}} for sessions created at
+    or after start, reading DailySessionStats for the rolled-up days.
+    """
+    filters = {}
+    if stakes is not None:
+        filters['stake__in'] = stakes
+    if bomb_probabilities is not None:
+        filters['bomb_probability__in'] = bomb_probabilities
+
+    return _stats_by_combo(
+        GameSession.objects.filter(**filters),
+        DailySessionStats.objects.filter(**filters),
+        DailyRollup.Kind.SESSIONS,
+        ('stake', 'bomb_probability'),
+        session_stat_aggregates(),
+        SESSION_STAT_FIELDS,
+        start
+    )
+
+
+def analytics_stats_by_combo(start, end, game_type=None, bomb_rate=None):
+    """
+    Return {(game_type, bomb_rate): {stat: total}} for GameAnalytics records
+    created in [start, end], reading DailyAnalyticsStats for the rolled-up days.
+    """
+    filters = {}
+    if game_type:
+        filters['game_type'] = game_type
+    if bomb_rate is not None:
+        filters['bomb_rate'] = bomb_rate
+
+    return _stats_by_combo(
+        GameAnalytics.objects.filter(**filters),
+        DailyAnalyticsStats.objects.filter(**filters),
+        DailyRollup.Kind.ANALYTICS,
+        ('game_type', 'bomb_rate'),
+        analytics_stat_aggregates(),
+        ANALYTICS_STAT_FIELDS,
+        start,
+        end
+    )
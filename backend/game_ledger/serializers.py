@@ -1,10 +1,27 @@
+import re
+
 from rest_framework import serializers
+from django.db.models import Prefetch
 from .models import GameSession, GameEvent
 
+# Grid positions are sent as 'row-col'; both fit a 10x10 grid in two ASCII digits
+CELL_POSITION_RE = re.compile(r'(\d{1,2})-(\d{1,2})', re.ASCII)
+
+# Columns shown in session listings; also used for .only() on their querysets
+SESSION_SUMMARY_FIELDS = [
+    'id', 'username', 'status', 'stake', 'total_winnings',
+    'created_at', 'ended_at'
+]
+
 
 class GameEventSerializer(serializers.ModelSerializer):
     """Serializer for GameEvent model"""
 
+    # The internal integer key stays private; clients see the UUID
+    id = serializers.UUIDField(source='public_id', read_only=True)
+    # Stored as cell_row/cell_col, served in the 'row-col' form clients send
+    cell_position = serializers.CharField(read_only=True)
+
     class Meta:
         model = GameEvent
         fields = [
@@ -15,10 +32,22 @@ class GameEventSerializer(serializers.ModelSerializer):
 
 
 class GameSessionSerializer(serializers.ModelSerializer):
-    """Serializer for GameSession model"""
+    """
+    Serializer for GameSession model.
+    Querysets passed to it should go through setup_eager_loading so the
+    nested events don't cost one query per session.
+    """
 
+    status = serializers.CharField(source='status_name', read_only=True)
     events = GameEventSerializer(many=True, read_only=True)
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Prefetch every session's events, in timeline order, in one extra query"""
+        return queryset.prefetch_related(
+            Prefetch('events', queryset=GameEvent.objects.order_by('timestamp', 'id'))
+        )
+
     class Meta:
         model = GameSession
         fields = [
@@ -29,6 +58,17 @@ class GameSessionSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'ended_at']
 
 
+class GameSessionListSerializer(serializers.ModelSerializer):
+    """Summary serializer for session listings; see GameSessionSerializer for events"""
+
+    status = serializers.CharField(source='status_name', read_only=True)
+
+    class Meta:
+        model = GameSession
+        fields = SESSION_SUMMARY_FIELDS
+        read_only_fields = SESSION_SUMMARY_FIELDS
+
+
 class StartGameSerializer(serializers.Serializer):
     """Serializer for starting a new game"""
 
@@ -36,7 +76,7 @@ class StartGameSerializer(serializers.Serializer):
     username = serializers.CharField(max_length=50)
     starting_balance = serializers.DecimalField(max_digits=12, decimal_places=2)
     grid_size = serializers.IntegerField(min_value=3, max_value=10)
-    bomb_probability = serializers.FloatField(min_value=5.0, max_value=50.0)
+    bomb_probability = serializers.IntegerField(min_value=5, max_value=50)
     stake = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=1)
 
     def validate(self, data):
@@ -57,10 +97,9 @@ class StartGameSerializer(serializers.Serializer):
         return data
 
 
-class GameEventCreateSerializer(serializers.Serializer):
-    """Serializer for creating game events"""
+class GameEventDataSerializer(serializers.Serializer):
+    """Serializer for the per-event fields shared by single and bulk event logging"""
 
-    session_id = serializers.UUIDField()
     event_type = serializers.ChoiceField(choices=GameEvent.EVENT_TYPE_CHOICES)
     amount = serializers.DecimalField(
         max_digits=12,
@@ -81,30 +120,6 @@ class GameEventCreateSerializer(serializers.Serializer):
         allow_blank=True,
         allow_null=True
     )
-    total_winnings = serializers.DecimalField(
-        max_digits=12,
-        decimal_places=2,
-        required=False,
-        allow_null=True
-    )
-    final_wallet_balance = serializers.DecimalField(
-        max_digits=12,
-        decimal_places=2,
-        required=False,
-        allow_null=True
-    )
-
-    def validate_session_id(self, value):
-        """Validate that the session exists and is active"""
-        try:
-            session = GameSession.objects.get(id=value)
-            if session.status != 'ACTIVE':
-                raise serializers.ValidationError(
-                    "Cannot log events for inactive game sessions"
-                )
-            return value
-        except GameSession.DoesNotExist:
-            raise serializers.ValidationError("Game session not found")
 
     def validate(self, data):
         """Additional validation based on event type"""
@@ -132,4 +147,59 @@ class GameEventCreateSerializer(serializers.Serializer):
                     "CASHOUT events must include balance"
                 )
 
+        # Store the grid position as separate row and column numbers
+        cell_position = data.pop('cell_position', None)
+        if cell_position:
+            match = CELL_POSITION_RE.fullmatch(cell_position)
+            if not match:
+                raise serializers.ValidationError(
+                    "cell_position must be in 'row-col' form, e.g. '2-3'"
+                )
+            data['cell_row'], data['cell_col'] = int(match[1]), int(match[2])
+
         return data
+
+
+class GameEventCreateSerializer(GameEventDataSerializer):
+    """Serializer for creating game events"""
+
+    session_id = serializers.UUIDField()
+    total_winnings = serializers.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        required=False,
+        allow_null=True
+    )
+    final_wallet_balance = serializers.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        required=False,
+        allow_null=True
+    )
+
+
+class BulkGameEventCreateSerializer(serializers.Serializer):
+    """Serializer for logging a batch of events for one session, e.g. a replay or import"""
+
+    session_id = serializers.UUIDField()
+    events = GameEventDataSerializer(many=True, allow_empty=False)
+    total_winnings = serializers.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        required=False,
+        allow_null=True
+    )
+    final_wallet_balance = serializers.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        required=False,
+        allow_null=True
+    )
+
+    def validate_events(self, events):
+        """Only the last event of a batch may end the session"""
+        if any(event['event_type'] in GameEvent.TERMINAL_EVENT_TYPES for event in events[:-1]):
+            raise serializers.ValidationError(
+                "Only the last event in a batch can be CASHOUT or BOMB_HIT"
+            )
+        return events
@@ -6,7 +6,9 @@ app_name = 'game_ledger'
 urlpatterns = [
     # Game session management
     path('game/start/', views.start_game, name='start_game'),
+    path('game/start/bulk/', views.start_games, name='start_games'),
     path('game/event/', views.log_game_event, name='log_game_event'),
+    path('game/events/bulk/', views.bulk_log_game_events, name='bulk_log_game_events'),
     path('game/session/<uuid:session_id>/', views.get_game_session, name='get_game_session'),
     path('game/user/<str:user_id>/sessions/', views.get_user_sessions, name='get_user_sessions'),
 
@@ -18,6 +20,7 @@ urlpatterns = [
     path('analytics/filtered/', views.filtered_analytics_dashboard, name='filtered_analytics_dashboard'),
     path('analytics/filtered-data/', views.filtered_analytics_data, name='filtered_analytics_data'),
     path('analytics/submit/', views.submit_game_analytics, name='submit_game_analytics'),
+    path('analytics/submit/bulk/', views.submit_game_analytics_bulk, name='submit_game_analytics_bulk'),
 
     # High-Performance Profit Stats
     path('analytics/current-profit/', views.current_profit_stats, name='current_profit_stats'),
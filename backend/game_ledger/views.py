@@ -2,20 +2,110 @@ from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.shortcuts import get_object_or_404, render
-from django.db.models import Count, Avg, Sum, Q
-from django.http import JsonResponse
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.views.decorators.http import require_GET
 from django.core.cache import cache
+from collections import defaultdict
+from urllib.parse import urlencode
 from datetime import datetime, timedelta
+import hashlib
+import uuid
 
 from .models import GameSession, GameEvent, GameAnalytics, DailyProfitStats
+from .profit import LATEST_PROFIT_CACHE_KEY, LATEST_PROFIT_CACHE_TIMEOUT
+from .renderers import dumps, ORJSONResponse
+from .rollups import analytics_stats_by_combo, session_stats_by_combo, unmark_session_days
 from .serializers import (
     StartGameSerializer,
     GameEventCreateSerializer,
+    BulkGameEventCreateSerializer,
     GameSessionSerializer,
+    GameSessionListSerializer,
+    SESSION_SUMMARY_FIELDS,
     GameEventSerializer
 )
 
+# Cached analytics_data payload. The cache is per process, so deleting the key
+# only helps the process that handled the write; the TTL bounds staleness elsewhere
+ANALYTICS_DATA_CACHE_KEY = 'analytics_data_v1'
+ANALYTICS_DATA_CACHE_TIMEOUT = 60
+
+# analytics_data reports on sessions since this date, for these fixed
+# (stake, bomb_probability) combinations
+ANALYTICS_START_DATE = datetime(2025, 10, 2, tzinfo=timezone.utc)
+ANALYTICS_COMBINATIONS = ((100, 15), (100, 25), (200, 15), (200, 25))
+ANALYTICS_STAKES = frozenset(stake for stake, _ in ANALYTICS_COMBINATIONS)
+ANALYTICS_BOMB_RATES = frozenset(bomb_rate for _, bomb_rate in ANALYTICS_COMBINATIONS)
+
+# Statistics reported for a combination without any sessions
+EMPTY_COMBINATION_STATS = {
+    'total_sessions': 0,
+    'cashed_out': 0,
+    'bomb_hits': 0,
+    'win_rate': 0,
+    'avg_winnings': 0,
+    'total_stakes': 0,
+    'total_payouts': 0,
+    'house_profit': 0,
+    'house_edge': 0,
+}
+
+# Cached filtered_analytics_data payloads, keyed by a hash of the query string
+FILTERED_ANALYTICS_CACHE_PREFIX = 'analytics:filtered:'
+FILTERED_ANALYTICS_CACHE_TIMEOUT = 60
+
+# Rows per INSERT statement in bulk_log_game_events
+BULK_EVENT_BATCH_SIZE = 1000
+
+# get_user_sessions page sizes
+USER_SESSIONS_PAGE_SIZE = 50
+USER_SESSIONS_MAX_PAGE_SIZE = 200
+
+# Serialized get_game_session payloads; active sessions are only cached briefly.
+# The cache is per process, so finished ones also expire to pick up admin edits
+ACTIVE_SESSION_CACHE_TIMEOUT = 5
+FINISHED_SESSION_CACHE_TIMEOUT = 60
+
+
+def session_cache_key(session_id):
+    """Cache key of a session's serialized detail payload"""
+    return f'game_session:{session_id}'
+
+
+@receiver([post_save, post_delete], sender=GameSession)
+@receiver([post_save, post_delete], sender=GameEvent)
+def invalidate_edited_session(sender, instance, **kwargs):
+    """Drop the cached detail payload of a session saved, deleted or given new events one at a time"""
+    session_id = instance.pk if sender is GameSession else instance.session_id
+    transaction.on_commit(lambda: cache.delete(session_cache_key(session_id)))
+
+
+def _new_game(validated_data):
+    """Build an unsaved session and its GAME_STARTED event from StartGameSerializer data"""
+    game_session = GameSession(
+        user_id=validated_data['user_id'],
+        username=validated_data['username'],
+        starting_balance=validated_data['starting_balance'],
+        stake=validated_data['stake'],
+        grid_size=validated_data['grid_size'],
+        bomb_probability=validated_data['bomb_probability'],
+        status=GameSession.Status.ACTIVE
+    )
+    start_event = GameEvent(
+        session=game_session,
+        event_type='GAME_STARTED',
+        amount=validated_data['stake'],
+        balance=validated_data['starting_balance'] - validated_data['stake'],
+        multiplier=1.0
+    )
+    return game_session, start_event
+
 
 @api_view(['POST'])
 def start_game(request):
@@ -44,34 +134,114 @@ def start_game(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    validated_data = serializer.validated_data
+    game_session, start_event = _new_game(serializer.validated_data)
 
-    # Create new game session
-    game_session = GameSession.objects.create(
-        user_id=validated_data['user_id'],
-        username=validated_data['username'],
-        starting_balance=validated_data['starting_balance'],
-        stake=validated_data['stake'],
-        grid_size=validated_data['grid_size'],
-        bomb_probability=validated_data['bomb_probability'],
-        status='ACTIVE'
-    )
-
-    # Create initial GAME_STARTED event
-    GameEvent.objects.create(
-        session=game_session,
-        event_type='GAME_STARTED',
-        amount=validated_data['stake'],
-        balance=validated_data['starting_balance'] - validated_data['stake'],
-        multiplier=1.0
-    )
+    # The UUID primary key is known up front, so both rows go out in one transaction
+    with transaction.atomic():
+        GameSession.objects.bulk_create([game_session])
+        GameEvent.objects.bulk_create([start_event])
+        # New sessions count towards the dashboard totals
+        transaction.on_commit(lambda: cache.delete(ANALYTICS_DATA_CACHE_KEY))
 
     return Response({
         'session_id': str(game_session.id),
-        'status': game_session.status
+        'status': game_session.status_name
     }, status=status.HTTP_201_CREATED)
 
 
+@api_view(['POST'])
+def start_games(request):
+    """
+    Start several game sessions in one request and one transaction
+
+    POST /game/start/bulk/
+    Request: [
+        {"user_id": "string", "username": "PlayerName", "starting_balance": 1000,
+         "grid_size": 5, "bomb_probability": 20, "stake": 100},
+        ...
+    ]
+    Response: [
+        {"session_id": "<uuid>", "status": "ACTIVE"},
+        ...
+    ]
+    """
+    serializer = StartGameSerializer(data=request.data, many=True, allow_empty=False)
+
+    if not serializer.is_valid():
+        return Response(
+            {'error': 'Invalid data', 'details': serializer.errors},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    games = [_new_game(validated_data) for validated_data in serializer.validated_data]
+
+    # Two multi-row INSERTs and a single commit for the whole batch
+    with transaction.atomic():
+        GameSession.objects.bulk_create([game_session for game_session, _ in games])
+        GameEvent.objects.bulk_create([start_event for _, start_event in games])
+        # New sessions count towards the dashboard totals
+        transaction.on_commit(lambda: cache.delete(ANALYTICS_DATA_CACHE_KEY))
+
+    return Response([
+        {'session_id': str(game_session.id), 'status': game_session.status_name}
+        for game_session, _ in games
+    ], status=status.HTTP_201_CREATED)
+
+
+def _session_error_response(session_exists):
+    """Error response for an event on a missing or already finished session"""
+    if not session_exists:
+        return Response(
+            {'error': 'Game session not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    return Response(
+        {'error': 'Cannot log events for inactive game sessions'},
+        status=status.HTTP_400_BAD_REQUEST
+    )
+
+
+def _lock_active_session(session_id):
+    """
+    Lock the session row so a concurrent terminal event can't end it
+    mid-insert. Returns an error response if it is missing or finished.
+    """
+    try:
+        game_session = (
+            GameSession.objects.select_for_update()
+            .only('id', 'status')
+            .get(id=session_id)
+        )
+    except GameSession.DoesNotExist:
+        return _session_error_response(session_exists=False)
+    if game_session.status != GameSession.Status.ACTIVE:
+        return _session_error_response(session_exists=True)
+    return None
+
+
+def _session_end_fields(total_winnings, final_wallet_balance):
+    """Session columns to set when it ends, skipping values the client didn't send"""
+    fields = {}
+    if total_winnings is not None:
+        fields['total_winnings'] = total_winnings
+    if final_wallet_balance is not None:
+        fields['final_wallet_balance'] = final_wallet_balance
+    return fields
+
+
+def _invalidate_session_caches(session_id, ended):
+    """Drop cached payloads (once the transaction commits) and rollups affected by new events"""
+    # The new events change the session's cached detail payload
+    transaction.on_commit(lambda: cache.delete(session_cache_key(session_id)))
+
+    if ended:
+        # A session ending after its day was rolled up makes that day's rollup stale
+        unmark_session_days(GameSession.objects.filter(id=session_id))
+
+        # A finished session changes the dashboard numbers
+        transaction.on_commit(lambda: cache.delete(ANALYTICS_DATA_CACHE_KEY))
+
+
 @api_view(['POST'])
 def log_game_event(request):
     """
@@ -105,49 +275,95 @@ def log_game_event(request):
     total_winnings = validated_data.pop('total_winnings', None)
     final_wallet_balance = validated_data.pop('final_wallet_balance', None)
 
-    # Get the game session
-    try:
-        game_session = GameSession.objects.get(id=session_id)
-    except GameSession.DoesNotExist:
-        return Response(
-            {'error': 'Game session not found'},
-            status=status.HTTP_404_NOT_FOUND
+    terminal_status = GameEvent.TERMINAL_EVENT_TYPES.get(validated_data['event_type'])
+
+    with transaction.atomic():
+        if terminal_status:
+            # End the session only if it is still active, in a single UPDATE
+            ended = GameSession.objects.filter(id=session_id, status=GameSession.Status.ACTIVE).end(
+                terminal_status, **_session_end_fields(total_winnings, final_wallet_balance)
+            )
+            if not ended:
+                # Only now tell a missing session apart from a finished one
+                return _session_error_response(GameSession.objects.filter(id=session_id).exists())
+        else:
+            error_response = _lock_active_session(session_id)
+            if error_response:
+                return error_response
+
+        # Create the game event (without session-level fields)
+        game_event = GameEvent.objects.create(
+            session_id=session_id,
+            **validated_data
         )
 
-    # Check if session is still active
-    if game_session.status != 'ACTIVE':
+        _invalidate_session_caches(session_id, ended=bool(terminal_status))
+
+    return Response({
+        'success': True,
+        'event_id': str(game_event.public_id)
+    }, status=status.HTTP_201_CREATED)
+
+
+@api_view(['POST'])
+def bulk_log_game_events(request):
+    """
+    Log a batch of events for one session, e.g. when replaying or importing games
+
+    POST /game/events/bulk/
+    Request: {
+        "session_id": "<uuid>",
+        "events": [
+            {"event_type": "FLIP", "multiplier": 1.1, "cell_position": "2-3"},
+            {"event_type": "CASHOUT", "amount": 110, "balance": 1010}
+        ],
+        "total_winnings": 110,
+        "final_wallet_balance": 1010
+    }
+    Response: {
+        "success": true,
+        "event_ids": ["<uuid>", ...]
+    }
+    """
+    serializer = BulkGameEventCreateSerializer(data=request.data)
+
+    if not serializer.is_valid():
         return Response(
-            {'error': 'Cannot log events for inactive game sessions'},
+            {'error': 'Invalid data', 'details': serializer.errors},
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    # Create the game event (without session-level fields)
-    game_event = GameEvent.objects.create(
-        session=game_session,
-        **validated_data
-    )
-
-    # Update session status if this is a terminal event
-    if validated_data['event_type'] in ['CASHOUT', 'BOMB_HIT']:
-        # Map event types to session status
-        status_mapping = {
-            'CASHOUT': 'CASHED_OUT',
-            'BOMB_HIT': 'BOMB_HIT'
-        }
-        game_session.status = status_mapping[validated_data['event_type']]
-        game_session.ended_at = timezone.now()
+    validated_data = serializer.validated_data
+    session_id = validated_data['session_id']
+    events = validated_data['events']
+    terminal_status = GameEvent.TERMINAL_EVENT_TYPES.get(events[-1]['event_type'])
+
+    with transaction.atomic():
+        error_response = _lock_active_session(session_id)
+        if error_response:
+            return error_response
+
+        # One multi-row INSERT per batch instead of a round-trip per event
+        game_events = GameEvent.objects.bulk_create(
+            [GameEvent(session_id=session_id, **event) for event in events],
+            batch_size=BULK_EVENT_BATCH_SIZE
+        )
 
-        # Update total winnings and final wallet balance
-        if total_winnings is not None:
-            game_session.total_winnings = total_winnings
-        if final_wallet_balance is not None:
-            game_session.final_wallet_balance = final_wallet_balance
+        # Only the last event may be terminal (enforced by the serializer)
+        if terminal_status:
+            GameSession.objects.filter(id=session_id).end(
+                terminal_status,
+                **_session_end_fields(
+                    validated_data.get('total_winnings'),
+                    validated_data.get('final_wallet_balance')
+                )
+            )
 
-        game_session.save()
+        _invalidate_session_caches(session_id, ended=bool(terminal_status))
 
     return Response({
         'success': True,
-        'event_id': str(game_event.id)
+        'event_ids': [str(game_event.public_id) for game_event in game_events]
     }, status=status.HTTP_201_CREATED)
 
 
@@ -159,24 +375,94 @@ def get_game_session(request, session_id):
     GET /game/session/<uuid>/
     Response: GameSession with nested events
     """
-    game_session = get_object_or_404(GameSession, id=session_id)
-    serializer = GameSessionSerializer(game_session)
-    return Response(serializer.data)
+    cache_key = session_cache_key(session_id)
+    payload = cache.get(cache_key)
+
+    if payload is None:
+        game_session = get_object_or_404(
+            GameSessionSerializer.setup_eager_loading(GameSession.objects.all()), id=session_id
+        )
+        payload = dumps(GameSessionSerializer(game_session).data)
+
+        # Finished sessions only change through the admin, active ones only briefly skip re-serializing
+        if game_session.status in GameSession.TERMINAL_STATUSES:
+            cache.set(cache_key, payload, timeout=FINISHED_SESSION_CACHE_TIMEOUT)
+        else:
+            cache.set(cache_key, payload, timeout=ACTIVE_SESSION_CACHE_TIMEOUT)
+
+    return ORJSONResponse(payload)
 
 
 @api_view(['GET'])
 def get_user_sessions(request, user_id):
     """
-    Get all game sessions for a specific user
+    Get a page of game sessions for a specific user, newest first
 
-    GET /game/user/<user_id>/sessions/
-    Response: List of GameSessions
+    GET /game/user/<user_id>/sessions/?before=<next_cursor>&limit=50
+    Response: {
+        "results": [GameSession summaries (without events)],
+        "next_cursor": "<created_at>_<id> of the last session" or null
+    }
     """
-    sessions = GameSession.objects.filter(user_id=user_id)
-    serializer = GameSessionSerializer(sessions, many=True)
-    return Response(serializer.data)
+    try:
+        limit = min(int(request.query_params.get('limit', USER_SESSIONS_PAGE_SIZE)), USER_SESSIONS_MAX_PAGE_SIZE)
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        return Response(
+            {'error': 'limit must be a positive integer'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # Listings only need the summary columns; events come from get_game_session
+    sessions = (
+        GameSession.objects
+        .filter(user_id=user_id)
+        .only(*SESSION_SUMMARY_FIELDS)
+        .order_by('-created_at', '-id')
+    )
+
+    # Keyset pagination: each page starts right after the previous page's last
+    # (created_at, id), walking the (user_id, -created_at) index. The id breaks
+    # ties between sessions created in the same instant, e.g. by start_games.
+    before = request.query_params.get('before')
+    if before:
+        before_ts, _, before_id = before.partition('_')
+        try:
+            before_ts = parse_datetime(before_ts)
+            before_id = uuid.UUID(before_id) if before_id else None
+        except ValueError:
+            before_ts = None
+        if before_ts is None:
+            return Response(
+                {'error': 'before must be a next_cursor value or an ISO 8601 timestamp'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if timezone.is_naive(before_ts):
+            before_ts = timezone.make_aware(before_ts)
+        older = Q(created_at__lt=before_ts)
+        if before_id:
+            older |= Q(created_at=before_ts, id__lt=before_id)
+        sessions = sessions.filter(older)
+
+    # Fetch one extra row to know whether another page follows
+    page = list(sessions[:limit + 1])
+    has_more = len(page) > limit
+    page = page[:limit]
+
+    next_cursor = None
+    if has_more:
+        # UTC with a 'Z' suffix so the cursor survives unencoded in a query string
+        next_cursor = f"{page[-1].created_at.strftime('%Y-%m-%dT%H:%M:%S.%fZ')}_{page[-1].id}"
+
+    serializer = GameSessionListSerializer(page, many=True)
+    return Response({
+        'results': serializer.data,
+        'next_cursor': next_cursor
+    })
 
 
+@require_GET
 def analytics_dashboard(request):
     """
     Render the analytics dashboard HTML page
@@ -184,115 +470,121 @@ def analytics_dashboard(request):
     return render(request, 'analytics/dashboard.html')
 
 
-@api_view(['GET'])
-def analytics_data(request):
-    """
-    Get analytics data for the dashboard
+def build_analytics_data():
+    """Compute the analytics dashboard payload broken down by stake amount and bomb rate"""
+    # Rolled-up daily stats plus a live aggregate of the days not rolled up yet,
+    # for every combination so the overall totals come from the same rows
+    combo_stats = session_stats_by_combo(ANALYTICS_START_DATE)
+    combo_sessions = GameSession.objects.filter(
+        created_at__gte=ANALYTICS_START_DATE,
+        stake__in=ANALYTICS_STAKES,
+        bomb_probability__in=ANALYTICS_BOMB_RATES
+    )
 
-    GET /analytics/data/
-    Response: Analytics data broken down by stake amount and bomb rate
-    """
-    # Get sessions from October 2, 2025 onwards
-    start_date = datetime(2025, 10, 2, tzinfo=timezone.utc)
-    sessions = GameSession.objects.filter(created_at__gte=start_date)
-
-    # Define our fixed combinations
-    combinations = [
-        {'stake': 100, 'bomb_rate': 15},
-        {'stake': 100, 'bomb_rate': 25},
-        {'stake': 200, 'bomb_rate': 15},
-        {'stake': 200, 'bomb_rate': 25},
-    ]
+    # Last 10 sessions of every combination in one query, bucketed in Python
+    recent_by_combo = defaultdict(list)
+    recent_rows = (
+        combo_sessions
+        .annotate(row_number=Window(
+            RowNumber(),
+            partition_by=[F('stake'), F('bomb_probability')],
+            order_by=F('created_at').desc()
+        ))
+        .filter(row_number__lte=10)
+        .order_by('-created_at')
+        .values('id', 'username', 'status', 'total_winnings', 'created_at', 'stake', 'bomb_probability')
+    )
+    for row in recent_rows:
+        row['status'] = GameSession.Status(row['status']).name
+        recent_by_combo[(row.pop('stake'), row.pop('bomb_probability'))].append(row)
 
     analytics_data = []
 
-    for combo in combinations:
-        # Filter sessions for this combination
-        combo_sessions = sessions.filter(
-            stake=combo['stake'],
-            bomb_probability=combo['bomb_rate']
-        )
-
-        total_sessions = combo_sessions.count()
+    for stake, bomb_rate in ANALYTICS_COMBINATIONS:
+        stats = combo_stats.get((stake, bomb_rate))
 
-        if total_sessions > 0:
-            # Calculate statistics
-            cashed_out = combo_sessions.filter(status='CASHED_OUT').count()
-            bomb_hits = combo_sessions.filter(status='BOMB_HIT').count()
+        if stats:
+            total_sessions = stats['total_sessions']
+            cashed_out = stats['cashed_out']
+            bomb_hits = stats['bomb_hits']
 
             # Calculate win rate
             win_rate = (cashed_out / total_sessions) * 100 if total_sessions > 0 else 0
 
-            # Calculate average winnings for successful cashouts
-            successful_sessions = combo_sessions.filter(status='CASHED_OUT', total_winnings__isnull=False)
-            avg_winnings = successful_sessions.aggregate(avg_win=Avg('total_winnings'))['avg_win'] or 0
-
-            # Calculate total revenue (stakes collected)
-            total_stakes = combo_sessions.aggregate(total_stakes=Sum('stake'))['total_stakes'] or 0
+            # Money totals are display-only here, so convert them to float once
+            # and keep the arithmetic below out of Decimal
+            total_stakes = float(stats['total_stakes'] or 0)
+            total_payouts = float(stats['total_payouts'] or 0)
 
-            # Calculate total payouts
-            total_payouts = combo_sessions.filter(total_winnings__isnull=False).aggregate(
-                total_payouts=Sum('total_winnings')
-            )['total_payouts'] or 0
+            # Average winnings for successful cashouts
+            avg_winnings = (
+                float(stats['cashed_out_winnings']) / stats['winnings_count']
+                if stats['winnings_count'] else 0
+            )
 
-            # Calculate house edge (profit margin)
-            house_profit = total_stakes - total_payouts
+            # Calculate house edge (profit margin); amounts carry 2 decimal places
+            house_profit = round(total_stakes - total_payouts, 2)
             house_edge = (house_profit / total_stakes) * 100 if total_stakes > 0 else 0
 
-            # Get recent sessions for this combination
-            recent_sessions = combo_sessions.order_by('-created_at')[:10].values(
-                'id', 'username', 'status', 'total_winnings', 'created_at'
-            )
-
             analytics_data.append({
-                'stake_amount': combo['stake'],
-                'bomb_rate': combo['bomb_rate'],
+                'stake_amount': stake,
+                'bomb_rate': bomb_rate,
                 'total_sessions': total_sessions,
                 'cashed_out': cashed_out,
                 'bomb_hits': bomb_hits,
                 'win_rate': round(win_rate, 2),
-                'avg_winnings': float(avg_winnings) if avg_winnings else 0,
-                'total_stakes': float(total_stakes),
-                'total_payouts': float(total_payouts),
-                'house_profit': float(house_profit),
+                'avg_winnings': avg_winnings,
+                'total_stakes': total_stakes,
+                'total_payouts': total_payouts,
+                'house_profit': house_profit,
                 'house_edge': round(house_edge, 2),
-                'recent_sessions': list(recent_sessions)
+                'recent_sessions': recent_by_combo[(stake, bomb_rate)]
             })
         else:
             # No sessions for this combination yet
             analytics_data.append({
-                'stake_amount': combo['stake'],
-                'bomb_rate': combo['bomb_rate'],
-                'total_sessions': 0,
-                'cashed_out': 0,
-                'bomb_hits': 0,
-                'win_rate': 0,
-                'avg_winnings': 0,
-                'total_stakes': 0,
-                'total_payouts': 0,
-                'house_profit': 0,
-                'house_edge': 0,
+                'stake_amount': stake,
+                'bomb_rate': bomb_rate,
+                **EMPTY_COMBINATION_STATS,
                 'recent_sessions': []
             })
 
-    # Overall statistics
+    # Overall statistics, summed from all combinations (not just the fixed ones)
     overall_stats = {
-        'total_sessions': sessions.count(),
-        'total_stakes': float(sessions.aggregate(total=Sum('stake'))['total'] or 0),
-        'total_payouts': float(sessions.filter(total_winnings__isnull=False).aggregate(
-            total=Sum('total_winnings'))['total'] or 0),
+        'total_sessions': sum(stats['total_sessions'] for stats in combo_stats.values()),
+        'total_stakes': float(sum(stats['total_stakes'] for stats in combo_stats.values())),
+        'total_payouts': float(sum(stats['total_payouts'] for stats in combo_stats.values())),
     }
     overall_stats['house_profit'] = overall_stats['total_stakes'] - overall_stats['total_payouts']
     overall_stats['house_edge'] = (overall_stats['house_profit'] / overall_stats['total_stakes']) * 100 if overall_stats['total_stakes'] > 0 else 0
 
-    return JsonResponse({
+    return {
         'combinations': analytics_data,
         'overall': overall_stats,
         'timestamp': timezone.now().isoformat()
-    })
+    }
 
 
-@api_view(['GET'])
+@require_GET
+def analytics_data(request):
+    """
+    Get analytics data for the dashboard
+
+    GET /analytics/data/
+    Response: Analytics data broken down by stake amount and bomb rate
+
+    The serialized payload is cached for a minute and dropped whenever a game
+    session starts or ends in this process.
+    """
+    payload = cache.get_or_set(
+        ANALYTICS_DATA_CACHE_KEY,
+        lambda: dumps(build_analytics_data()),
+        timeout=ANALYTICS_DATA_CACHE_TIMEOUT
+    )
+    return ORJSONResponse(payload)
+
+
+@require_GET
 def filtered_analytics_dashboard(request):
     """
     Render the filtered analytics dashboard HTML page
@@ -302,6 +594,35 @@ def filtered_analytics_dashboard(request):
     return render(request, 'analytics/filtered_dashboard.html')
 
 
+# Fields every submitted analytics record must include
+ANALYTICS_REQUIRED_FIELDS = ['game_type', 'stake_amount', 'winning_amount', 'multiplier', 'bomb_rate', 'game_outcome']
+
+# Records per INSERT statement in submit_game_analytics_bulk
+BULK_ANALYTICS_BATCH_SIZE = 500
+
+
+def _new_analytics_record(data):
+    """
+    Build an unsaved GameAnalytics record from a submitted body.
+    Returns (record, None), or (None, field) when a required field is missing.
+    """
+    for field in ANALYTICS_REQUIRED_FIELDS:
+        if field not in data:
+            return None, field
+
+    return GameAnalytics(
+        game_type=data['game_type'],
+        player_name=data.get('player_name', 'Anonymous'),
+        session_id=data.get('session_id'),
+        stake_amount=data['stake_amount'],
+        winning_amount=data['winning_amount'],
+        multiplier=data['multiplier'],
+        bomb_rate=data['bomb_rate'],
+        cards_flipped=data.get('cards_flipped', 0),
+        game_outcome=data['game_outcome']
+    ), None
+
+
 @api_view(['POST'])
 def submit_game_analytics(request):
     """
@@ -321,29 +642,15 @@ def submit_game_analytics(request):
     }
     """
     try:
-        # Extract data from request
-        data = request.data
-
         # Validate required fields
-        required_fields = ['game_type', 'stake_amount', 'winning_amount', 'multiplier', 'bomb_rate', 'game_outcome']
-        for field in required_fields:
-            if field not in data:
-                return Response({
-                    'error': f'Missing required field: {field}'
-                }, status=status.HTTP_400_BAD_REQUEST)
+        analytics_record, missing_field = _new_analytics_record(request.data)
+        if missing_field:
+            return Response({
+                'error': f'Missing required field: {missing_field}'
+            }, status=status.HTTP_400_BAD_REQUEST)
 
         # Create analytics record
-        analytics_record = GameAnalytics.objects.create(
-            game_type=data['game_type'],
-            player_name=data.get('player_name', 'Anonymous'),
-            session_id=data.get('session_id'),
-            stake_amount=data['stake_amount'],
-            winning_amount=data['winning_amount'],
-            multiplier=data['multiplier'],
-            bomb_rate=data['bomb_rate'],
-            cards_flipped=data.get('cards_flipped', 0),
-            game_outcome=data['game_outcome']
-        )
+        analytics_record.save(force_insert=True)
 
         return Response({
             'success': True,
@@ -357,7 +664,163 @@ def submit_game_analytics(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-@api_view(['GET'])
+@api_view(['POST'])
+def submit_game_analytics_bulk(request):
+    """
+    Submit several game records for analytics tracking in one transaction
+
+    POST /analytics/submit/bulk/
+    Body: [<submit_game_analytics body>, ...]
+    Response: {"success": true, "record_ids": ["<uuid>", ...]} in request order
+    """
+    if not isinstance(request.data, list) or not request.data:
+        return Response({
+            'error': 'Expected a non-empty list of analytics records'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    records = []
+    for index, data in enumerate(request.data):
+        if not isinstance(data, dict):
+            return Response({
+                'error': f'Record {index}: expected an object'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        analytics_record, missing_field = _new_analytics_record(data)
+        if missing_field:
+            return Response({
+                'error': f'Record {index}: missing required field: {missing_field}'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        records.append(analytics_record)
+
+    try:
+        # Multi-row INSERTs and a single commit for the whole batch
+        with transaction.atomic():
+            GameAnalytics.objects.bulk_create(records, batch_size=BULK_ANALYTICS_BATCH_SIZE)
+    except Exception as e:
+        return Response({
+            'error': f'Failed to create analytics records: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    return Response({
+        'success': True,
+        'record_ids': [str(analytics_record.id) for analytics_record in records]
+    }, status=status.HTTP_201_CREATED)
+
+
+def build_filtered_analytics_data(date_range, start_date, end_date, game_type_filter, bomb_rate_filter):
+    """Compute the filtered analytics dashboard payload for the given date range and filters"""
+    # Base queryset with date filter
+    queryset = GameAnalytics.objects.filter(created_at__gte=start_date, created_at__lte=end_date)
+
+    # Apply additional filters
+    if game_type_filter:
+        queryset = queryset.filter(game_type=game_type_filter)
+    if bomb_rate_filter:
+        queryset = queryset.filter(bomb_rate=int(bomb_rate_filter))
+
+    # Every combination present in the filtered data: rolled-up daily stats
+    # plus a live aggregate of the partial and not yet rolled-up days
+    combo_stats = analytics_stats_by_combo(
+        start_date,
+        end_date,
+        game_type=game_type_filter,
+        bomb_rate=int(bomb_rate_filter) if bomb_rate_filter else None
+    )
+    combo_rows = [
+        {'game_type': game_type, 'bomb_rate': bomb_rate, **stats}
+        for (game_type, bomb_rate), stats in sorted(combo_stats.items())
+    ]
+
+    # Last 10 records of every combination in one query, bucketed in Python
+    recent_by_combo = defaultdict(list)
+    recent_rows = (
+        queryset
+        .annotate(row_number=Window(
+            RowNumber(),
+            partition_by=[F('game_type'), F('bomb_rate')],
+            order_by=F('created_at').desc()
+        ))
+        .filter(row_number__lte=10)
+        .order_by('-created_at')
+        .values(
+            'id', 'player_name', 'game_outcome', 'stake_amount', 'winning_amount',
+            'multiplier', 'cards_flipped', 'created_at', 'game_type', 'bomb_rate'
+        )
+    )
+    for record in recent_rows:
+        recent_by_combo[(record['game_type'], record['bomb_rate'])].append({
+            'id': str(record['id']),
+            'player_name': record['player_name'] or 'Anonymous',
+            'outcome': record['game_outcome'],
+            'stake': float(record['stake_amount']),
+            'winnings': float(record['winning_amount']),
+            'multiplier': float(record['multiplier']),
+            'cards_flipped': record['cards_flipped'],
+            'created_at': record['created_at'].isoformat()
+        })
+
+    analytics_data = []
+
+    # Process each existing combination
+    for combo in combo_rows:
+        game_type = combo['game_type']
+        bomb_rate = combo['bomb_rate']
+        total_sessions = combo['total_sessions']
+        wins = combo['wins']
+
+        total_stakes = float(combo['total_stakes'] or 0)
+        total_payouts = float(combo['total_payouts'] or 0)
+        avg_multiplier = float(combo['multiplier_sum']) / total_sessions if total_sessions > 0 else 0
+        avg_cards_flipped = combo['cards_flipped_sum'] / total_sessions if total_sessions > 0 else 0
+
+        house_profit = total_stakes - total_payouts
+        house_edge = (house_profit / total_stakes) * 100 if total_stakes > 0 else 0
+        win_rate = (wins / total_sessions) * 100 if total_sessions > 0 else 0
+
+        analytics_data.append({
+            'game_type': game_type,
+            'bomb_rate': bomb_rate,
+            'total_sessions': total_sessions,
+            'wins': wins,
+            'losses': combo['losses'],
+            'perfect_games': combo['perfect_games'],
+            'win_rate': round(win_rate, 2),
+            'avg_multiplier': round(avg_multiplier, 2),
+            'avg_cards_flipped': round(avg_cards_flipped, 1),
+            'total_stakes': total_stakes,
+            'total_payouts': total_payouts,
+            'house_profit': house_profit,
+            'house_edge': f"{house_edge:.2f}",
+            'recent_sessions': recent_by_combo[(game_type, bomb_rate)]
+        })
+
+    # Overall statistics, summed from the combinations (which cover every record)
+    overall_stats = {
+        'total_sessions': sum(combo['total_sessions'] for combo in combo_rows),
+        'total_stakes': float(sum(combo['total_stakes'] or 0 for combo in combo_rows)),
+        'total_payouts': float(sum(combo['total_payouts'] or 0 for combo in combo_rows)),
+        'total_wins': sum(combo['wins'] for combo in combo_rows),
+        'total_losses': sum(combo['losses'] for combo in combo_rows),
+        'total_perfect_games': sum(combo['perfect_games'] for combo in combo_rows),
+    }
+    overall_stats['house_profit'] = overall_stats['total_stakes'] - overall_stats['total_payouts']
+    overall_stats['house_edge'] = (overall_stats['house_profit'] / overall_stats['total_stakes']) * 100 if overall_stats['total_stakes'] > 0 else 0
+    overall_stats['overall_win_rate'] = (overall_stats['total_wins'] / overall_stats['total_sessions']) * 100 if overall_stats['total_sessions'] > 0 else 0
+
+    return {
+        'combinations': analytics_data,
+        'overall': overall_stats,
+        'filters': {
+            'date_range': date_range,
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'game_type': game_type_filter,
+            'bomb_rate': bomb_rate_filter
+        },
+        'timestamp': timezone.now().isoformat()
+    }
+
+
+@require_GET
 def filtered_analytics_data(request):
     """
     Get filtered analytics data for the dashboard
@@ -394,131 +857,56 @@ def filtered_analytics_data(request):
                 start_date = datetime.strptime(start_date_str, '%Y-%m-%d').replace(tzinfo=timezone.utc)
                 end_date = datetime.strptime(end_date_str, '%Y-%m-%d').replace(hour=23, minute=59, second=59, tzinfo=timezone.utc)
             else:
-                return Response({
+                return ORJSONResponse({
                     'error': 'start_date and end_date required for custom date range'
                 }, status=status.HTTP_400_BAD_REQUEST)
         else:
-            return Response({
+            return ORJSONResponse({
                 'error': 'Invalid date_range. Use: today, week, month, or custom'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        # Base queryset with date filter
-        queryset = GameAnalytics.objects.filter(created_at__gte=start_date, created_at__lte=end_date)
-
-        # Apply additional filters
-        if game_type_filter:
-            queryset = queryset.filter(game_type=game_type_filter)
-        if bomb_rate_filter:
-            queryset = queryset.filter(bomb_rate=int(bomb_rate_filter))
-
-        # Get unique combinations that actually exist in the filtered data
-        combinations = queryset.values('game_type', 'bomb_rate').distinct().order_by('game_type', 'bomb_rate')
-
-        analytics_data = []
-
-        # Process each existing combination
-        for combo in combinations:
-            game_type = combo['game_type']
-            bomb_rate = combo['bomb_rate']
-            combo_records = queryset.filter(game_type=game_type, bomb_rate=bomb_rate)
-
-            if combo_records.exists():
-                    total_sessions = combo_records.count()
-                    wins = combo_records.filter(game_outcome='WIN').count()
-                    losses = combo_records.filter(game_outcome='LOSS').count()
-                    perfect_games = combo_records.filter(game_outcome='PERFECT').count()
-
-                    total_stakes = float(combo_records.aggregate(total=Sum('stake_amount'))['total'] or 0)
-                    total_payouts = float(combo_records.aggregate(total=Sum('winning_amount'))['total'] or 0)
-                    avg_multiplier = float(combo_records.aggregate(avg=Avg('multiplier'))['avg'] or 0)
-                    avg_cards_flipped = float(combo_records.aggregate(avg=Avg('cards_flipped'))['avg'] or 0)
-
-                    house_profit = total_stakes - total_payouts
-                    house_edge = (house_profit / total_stakes) * 100 if total_stakes > 0 else 0
-                    win_rate = (wins / total_sessions) * 100 if total_sessions > 0 else 0
-
-                    # Recent sessions (last 10)
-                    recent_sessions = []
-                    for record in combo_records.order_by('-created_at')[:10]:
-                        recent_sessions.append({
-                            'id': str(record.id),
-                            'player_name': record.player_name or 'Anonymous',
-                            'outcome': record.game_outcome,
-                            'stake': float(record.stake_amount),
-                            'winnings': float(record.winning_amount),
-                            'multiplier': float(record.multiplier),
-                            'cards_flipped': record.cards_flipped,
-                            'created_at': record.created_at.isoformat()
-                        })
-
-                    analytics_data.append({
-                        'game_type': game_type,
-                        'bomb_rate': bomb_rate,
-                        'total_sessions': total_sessions,
-                        'wins': wins,
-                        'losses': losses,
-                        'perfect_games': perfect_games,
-                        'win_rate': round(win_rate, 2),
-                        'avg_multiplier': round(avg_multiplier, 2),
-                        'avg_cards_flipped': round(avg_cards_flipped, 1),
-                        'total_stakes': total_stakes,
-                        'total_payouts': total_payouts,
-                        'house_profit': house_profit,
-                        'house_edge': f"{house_edge:.2f}",
-                        'recent_sessions': recent_sessions
-                    })
-
-        # Overall statistics
-        overall_stats = {
-            'total_sessions': queryset.count(),
-            'total_stakes': float(queryset.aggregate(total=Sum('stake_amount'))['total'] or 0),
-            'total_payouts': float(queryset.aggregate(total=Sum('winning_amount'))['total'] or 0),
-            'total_wins': queryset.filter(game_outcome='WIN').count(),
-            'total_losses': queryset.filter(game_outcome='LOSS').count(),
-            'total_perfect_games': queryset.filter(game_outcome='PERFECT').count(),
-        }
-        overall_stats['house_profit'] = overall_stats['total_stakes'] - overall_stats['total_payouts']
-        overall_stats['house_edge'] = (overall_stats['house_profit'] / overall_stats['total_stakes']) * 100 if overall_stats['total_stakes'] > 0 else 0
-        overall_stats['overall_win_rate'] = (overall_stats['total_wins'] / overall_stats['total_sessions']) * 100 if overall_stats['total_sessions'] > 0 else 0
-
-        return JsonResponse({
-            'combinations': analytics_data,
-            'overall': overall_stats,
-            'filters': {
-                'date_range': date_range,
-                'start_date': start_date.isoformat(),
-                'end_date': end_date.isoformat(),
-                'game_type': game_type_filter,
-                'bomb_rate': bomb_rate_filter
-            },
-            'timestamp': timezone.now().isoformat()
-        })
+        # Identical filter combinations share one cached payload for a minute
+        params = urlencode(sorted(request.GET.items()))
+        cache_key = f'{FILTERED_ANALYTICS_CACHE_PREFIX}{hashlib.md5(params.encode()).hexdigest()}'
+        payload = cache.get_or_set(
+            cache_key,
+            lambda: dumps(build_filtered_analytics_data(
+                date_range, start_date, end_date, game_type_filter, bomb_rate_filter
+            )),
+            timeout=FILTERED_ANALYTICS_CACHE_TIMEOUT
+        )
+        return ORJSONResponse(payload)
 
     except Exception as e:
-        return Response({
+        return ORJSONResponse({
             'error': f'Failed to fetch analytics data: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-@api_view(['GET'])
+@require_GET
 def current_profit_stats(request):
     """
     High-performance endpoint to retrieve current profit statistics.
     Optimized for sub-millisecond response time with caching.
     """
-    cache_key = 'daily_profit_stats_latest'
+    cache_key = LATEST_PROFIT_CACHE_KEY
 
     try:
         # Try to get data from cache first (sub-millisecond response)
         cached_data = cache.get(cache_key)
         if cached_data is not None:
-            return Response(cached_data, status=status.HTTP_200_OK)
+            return ORJSONResponse(cached_data, status=status.HTTP_200_OK)
 
         # Cache miss: query database
-        latest_stats = DailyProfitStats.objects.select_related().order_by('-date').first()
+        latest_stats = (
+            DailyProfitStats.objects
+            .only('date', 'profit_data', 'updated_at')
+            .order_by('-date')
+            .first()
+        )
 
         if not latest_stats:
-            return Response({
+            return ORJSONResponse({
                 'error': 'No profit statistics available'
             }, status=status.HTTP_404_NOT_FOUND)
 
@@ -529,16 +917,16 @@ def current_profit_stats(request):
             'last_updated': latest_stats.updated_at.isoformat()
         }
 
-        # Store in cache with 30-second TTL
+        # Store in cache; save_profit_stats and row edits invalidate it sooner
         try:
-            cache.set(cache_key, response_data, timeout=30)
+            cache.set(cache_key, response_data, timeout=LATEST_PROFIT_CACHE_TIMEOUT)
         except Exception as cache_error:
             # Log cache error but don't fail the request
             print(f"Cache set failed: {cache_error}")
 
-        return Response(response_data, status=status.HTTP_200_OK)
+        return ORJSONResponse(response_data, status=status.HTTP_200_OK)
 
     except Exception as e:
-        return Response({
+        return ORJSONResponse({
             'error': f'Failed to fetch profit statistics: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)